@@ -1,5 +1,84 @@
-from os import environ, getuid
+from os import environ, getuid, cpu_count
 
 
-TIMEOUT = 10  # seconds
+TIMEOUT = 10  # seconds, default time limit of the run
+# server maximums of time and memory limits requested by clients
+MAX_TIME_LIMIT = float(environ.get('MAX_TIME_LIMIT', TIMEOUT))  # seconds
+MAX_MEMORY_LIMIT = int(environ.get('MAX_MEMORY_LIMIT', 1024))  # megabytes
 SANDBOX_USER_UID = int(environ.get('SANDBOX_USER_UID', getuid()))
+
+# import library of prologd and its RAM-backed snapshot
+IMPORT_DIR = environ.get('IMPORT_DIR', 'import')
+IMPORT_SNAPSHOT_DIR = environ.get(
+    'IMPORT_SNAPSHOT_DIR', '/dev/shm/prologd-import'
+)
+IMPORT_CHECK_INTERVAL = 5  # seconds
+IMPORT_SNAPSHOT_TTL = 60  # seconds
+
+PROLOGD_BIN = environ.get('PROLOGD_BIN', 'prologd')
+
+# log of slow executions, disabled if the path is not set
+SLOW_LOG_PATH = environ.get('SLOW_LOG_PATH')
+SLOW_LOG_WALL_THRESHOLD = float(environ.get('SLOW_LOG_WALL_THRESHOLD', 2))
+SLOW_LOG_CPU_THRESHOLD = float(environ.get('SLOW_LOG_CPU_THRESHOLD', 2))
+SLOW_LOG_MAX_BYTES = 10 * 1024 * 1024
+SLOW_LOG_BACKUP_COUNT = 5
+
+# adaptive limit of concurrent prologd processes in the worker
+CONCURRENCY_MIN = int(environ.get('CONCURRENCY_MIN', 1))
+CONCURRENCY_MAX = int(environ.get('CONCURRENCY_MAX', 4 * (cpu_count() or 1)))
+CONCURRENCY_INITIAL = int(environ.get('CONCURRENCY_INITIAL', cpu_count() or 1))
+# the run is considered contended if wall time exceeds cpu time that many times
+CONCURRENCY_SLOWDOWN_TOLERANCE = 1.5
+# host is considered overloaded if load average per cpu exceeds it
+CONCURRENCY_LOAD_TOLERANCE = 1.0
+# runs with less cpu time give no reliable slowdown estimate
+CONCURRENCY_MIN_CPU = 0.05  # seconds
+CONCURRENCY_BACKOFF = 0.75
+CONCURRENCY_BACKOFF_INTERVAL = 1  # seconds
+CONCURRENCY_HISTORY_SIZE = 100
+
+# size of the history of tests run time used to run longest tests first
+RUNTIME_HISTORY_SIZE = 50000
+
+# compiled checker functions
+CHECKERS_CACHE_SIZE = 256
+
+# registered test suites
+SUITES_DIR = environ.get('SUITES_DIR', '/tmp/prologd-suites')
+SUITES_CACHE_SIZE = 128
+
+# extra time to wait for the identical execution in progress
+COALESCING_GRACE = 1  # seconds
+
+# inputs of that many characters and more are passed to prologd
+# as RAM-backed files instead of the stdin pipe
+INPUT_FILE_THRESHOLD = int(environ.get('INPUT_FILE_THRESHOLD', 64 * 1024))
+INPUT_CACHE_MAX_BYTES = int(
+    environ.get('INPUT_CACHE_MAX_BYTES', 256 * 1024 * 1024)
+)
+
+# normalized code of programs
+CODE_CACHE_SIZE = 128
+
+# interactive sessions kept in memory of the worker
+SESSIONS_MAX = int(environ.get('SESSIONS_MAX', 32))
+# idle timeout and cpu time budget of the session in seconds
+SESSION_IDLE_TIMEOUT = float(environ.get('SESSION_IDLE_TIMEOUT', 300))
+SESSION_CPU_BUDGET = float(environ.get('SESSION_CPU_BUDGET', 60))
+
+# tests of the suite are run in one prologd process by batches of that size
+# if the program allows it, 1 disables batches
+BATCH_SIZE = int(environ.get('BATCH_SIZE', 16))
+# tests expected to run longer are run in own processes
+BATCH_MAX_TEST_TIME = 0.1  # seconds
+
+# results of executions shared by workers, disabled if the path is not set
+RESULT_CACHE_PATH = environ.get('RESULT_CACHE_PATH')
+RESULT_CACHE_MAX_BYTES = int(
+    environ.get('RESULT_CACHE_MAX_BYTES', 512 * 1024 * 1024)
+)
+RESULT_CACHE_BUSY_TIMEOUT = 1  # seconds
+RESULT_CACHE_TOUCH_INTERVAL = 60  # seconds
+# size of the database is checked once per that many results
+RESULT_CACHE_EVICT_INTERVAL = 100
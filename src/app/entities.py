@@ -2,6 +2,18 @@ from typing import Optional, List
 from dataclasses import dataclass
 
 
+@dataclass
+class TimingData:
+
+    queue_wait: float = 0
+    spawn: float = 0
+    wall: float = 0
+    cpu_user: Optional[float] = None
+    cpu_sys: Optional[float] = None
+    output_bytes: int = 0
+    checker: Optional[float] = None
+
+
 @dataclass
 class DebugData:
 
@@ -9,6 +21,10 @@ class DebugData:
     code: Optional[str] = None
     result: Optional[str] = None
     error: Optional[str] = None
+    time_limit: Optional[float] = None
+    memory_limit: Optional[int] = None
+    with_timing: bool = False
+    timing: Optional[TimingData] = None
 
 
 @dataclass
@@ -21,6 +37,7 @@ class TestData:
     result: Optional[str] = None
     error: Optional[str] = None
     ok: Optional[bool] = None
+    timing: Optional[TimingData] = None
 
 
 @dataclass
@@ -34,3 +51,38 @@ class TestsData:
     ok: Optional[bool] = None
     code: Optional[str] = None
     checker: Optional[str] = None
+    time_limit: Optional[float] = None
+    memory_limit: Optional[int] = None
+    with_timing: bool = False
+    verbosity: str = 'full'
+
+
+@dataclass
+class SuiteData:
+
+    tests: List[TestData]
+    checker: Optional[str] = None
+    id: Optional[str] = None
+
+
+@dataclass
+class SessionData:
+
+    code: Optional[str] = None
+    time_limit: Optional[float] = None
+    memory_limit: Optional[int] = None
+    id: Optional[str] = None
+    cpu_budget: Optional[float] = None
+
+
+@dataclass
+class QueryData:
+
+    query: Optional[str] = None
+    data_in: Optional[str] = None
+    session_id: Optional[str] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+    with_timing: bool = False
+    timing: Optional[TimingData] = None
+    cpu_left: Optional[float] = None
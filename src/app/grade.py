@@ -0,0 +1,189 @@
+""" Grades submissions offline without the web server,
+    running them in the pool of processes:
+
+    python -m app.grade submissions.jsonl --suites suites/ -o results.jsonl
+
+    Submissions are JSONL files or directories of them (and of JSON files
+    with one submission each). A submission is the body of the /testing/
+    request with the "id" field. Instead of tests and checker it may
+    reference by name "suite" the file of the suites directory in the format
+    of the /suites/ request body, or "suite_id" of the registered suite.
+
+    Results are appended to the output file as soon as they are ready,
+    submissions already present in it are skipped on the next run """
+
+import os
+import sys
+import json
+import time
+import argparse
+from functools import lru_cache
+from multiprocessing import Pool
+from typing import Iterator, List, Optional, Set, Tuple
+from marshmallow import ValidationError
+from app import config
+from app.schema import TestsSchema, SuiteTestsSchema
+from app.service.exceptions import ServiceException
+from app.service.library import ImportLibrary
+from app.service.main import PrologDService
+
+Submission = Tuple[str, dict]
+
+_suites_dir: Optional[str] = None
+
+
+def read_submissions(path: str) -> Iterator[Submission]:
+
+    """ Submissions with ids, the id defaults
+        to the file name and the line number """
+
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith(('.json', '.jsonl')):
+                yield from read_submissions(os.path.join(path, name))
+        return
+    with open(path, encoding='utf-8') as f:
+        if not path.endswith('.jsonl'):
+            submission = json.load(f)
+            name = os.path.splitext(os.path.basename(path))[0]
+            yield str(submission.get('id', name)), submission
+            return
+        for number, line in enumerate(f, start=1):
+            if line.strip():
+                submission = json.loads(line)
+                yield str(submission.get('id', f'{path}:{number}')), submission
+
+
+def read_graded(path: str) -> Set[str]:
+
+    """ Ids of submissions in the output file. The last line
+        is cut off if the previous run was interrupted while writing it """
+
+    graded = set()
+    if not os.path.exists(path):
+        return graded
+    with open(path, 'rb+') as f:
+        end = 0
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            graded.add(json.loads(line)['id'])
+            end += len(line)
+        f.truncate(end)
+    return graded
+
+
+@lru_cache(maxsize=config.SUITES_CACHE_SIZE)
+def _get_suite(name: str) -> dict:
+    with open(os.path.join(_suites_dir, f'{name}.json'), 'rb') as f:
+        return json.load(f)
+
+
+def grade(item: Submission) -> str:
+
+    """ JSON line with the result of the submission,
+        the same as the response of the /testing/ endpoint """
+
+    submission_id, submission = item
+    submission = dict(submission)
+    submission.pop('id', None)
+    try:
+        suite = submission.pop('suite', None)
+        if suite is not None:
+            if _suites_dir is None:
+                raise ValidationError({'suite': ['Unknown suite.']})
+            try:
+                submission.update(_get_suite(suite))
+            except (OSError, ValueError):
+                raise ValidationError({'suite': ['Unknown suite.']})
+        if 'suite_id' in submission:
+            schema = SuiteTestsSchema()
+        else:
+            schema = TestsSchema()
+        result = schema.dump(PrologDService.testing(schema.load(submission)))
+    except ValidationError as ex:
+        result = {'error': 'Validation error', 'details': ex.messages}
+    except ServiceException as ex:
+        result = {'error': ex.message, 'details': ex.details}
+    return json.dumps({'id': submission_id, **result}, ensure_ascii=False)
+
+
+def _init_worker(suites_dir: Optional[str]):
+    global _suites_dir
+    _suites_dir = suites_dir
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m app.grade',
+        description='Grade submissions offline'
+    )
+    parser.add_argument(
+        'paths',
+        nargs='+',
+        help='JSONL files or directories of submissions'
+    )
+    parser.add_argument(
+        '-o', '--output',
+        required=True,
+        help='JSONL file of results, the run is resumed if it exists'
+    )
+    parser.add_argument('--suites', help='directory of suites by name')
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='number of worker processes'
+    )
+    args = parser.parse_args(argv)
+
+    graded = read_graded(args.output)
+    submissions = [
+        item
+        for path in args.paths
+        for item in read_submissions(path)
+        if item[0] not in graded
+    ]
+    total = len(submissions)
+    print(
+        f'submissions: {total}, already graded: {len(graded)}',
+        file=sys.stderr
+    )
+    # workers are forked with the snapshot of the import library
+    ImportLibrary.refresh()
+    started = time.monotonic()
+    done = num_tests = num_ok = 0
+    with open(args.output, 'a', encoding='utf-8') as output, Pool(
+        processes=args.processes,
+        initializer=_init_worker,
+        initargs=(args.suites,)
+    ) as pool:
+        for line in pool.imap_unordered(grade, submissions):
+            output.write(line + '\n')
+            output.flush()
+            result = json.loads(line)
+            done += 1
+            num_tests += result.get('num', 0)
+            num_ok += result.get('num_ok', 0)
+            elapsed = time.monotonic() - started
+            print(
+                f'\r{done}/{total} {done / elapsed:.1f} submissions/s',
+                end='',
+                file=sys.stderr
+            )
+    elapsed = time.monotonic() - started
+    if done:
+        print(file=sys.stderr)
+    print(
+        f'submissions: {done}, '
+        f'tests: {num_tests}, '
+        f'passed: {num_ok}, '
+        f'time: {elapsed:.3f}s, '
+        f'throughput: {done / elapsed if elapsed else 0:.1f} submissions/s, '
+        f'{num_tests / elapsed if elapsed else 0:.1f} tests/s'
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,20 +9,34 @@ from app.service.main import PrologDService
 from app.schema import (
     DebugSchema,
     TestsSchema,
+    SuiteTestsSchema,
+    SuiteSchema,
+    SessionSchema,
+    QuerySchema,
     BadRequestSchema,
     ServiceExceptionSchema
 )
-from app.service.exceptions import ServiceException
+from app.service.exceptions import ServiceException, SessionException
+from app.service import metrics
+from app.service.library import ImportLibrary
+from app.service.limiter import limiter
 
 
 def create_app():
 
     app = Flask(__name__)
+    ImportLibrary.refresh()
 
     @app.errorhandler(400)
     def bad_request_handler(ex: ValidationError):
         return BadRequestSchema().dump(ex), 400
 
+    @app.errorhandler(404)
+    def not_found_handler(ex: SessionException):
+        if not isinstance(ex.description, SessionException):
+            return ex
+        return ServiceExceptionSchema().dump(ex), 404
+
     @app.errorhandler(500)
     def bad_request_handler(ex: ServiceException):
         return ServiceExceptionSchema().dump(ex), 500
@@ -31,6 +45,13 @@ def create_app():
     def index():
         return render_template("index.html")
 
+    @app.route('/metrics/', methods=['get'])
+    def get_metrics():
+        return {
+            **metrics.snapshot(),
+            'concurrency': limiter.snapshot()
+        }
+
     @app.route('/debug/', methods=['post'])
     def debug():
         schema = DebugSchema()
@@ -47,9 +68,25 @@ def create_app():
 
     @app.route('/testing/', methods=['post'])
     def testing():
-        schema = TestsSchema()
+        json = request.get_json()
+        if isinstance(json, dict) and 'suite_id' in json:
+            schema = SuiteTestsSchema()
+        else:
+            schema = TestsSchema()
+        try:
+            data = PrologDService.testing(schema.load(json))
+        except ValidationError as ex:
+            abort(400, ex)
+        except ServiceException as ex:
+            abort(500, ex)
+        else:
+            return schema.dump(data)
+
+    @app.route('/suites/', methods=['post'])
+    def register_suite():
+        schema = SuiteSchema()
         try:
-            data = PrologDService.testing(
+            data = PrologDService.register_suite(
                 schema.load(request.get_json())
             )
         except ValidationError as ex:
@@ -58,6 +95,44 @@ def create_app():
             abort(500, ex)
         else:
             return schema.dump(data)
+
+    @app.route('/sessions/', methods=['post'])
+    def create_session():
+        schema = SessionSchema()
+        try:
+            data = PrologDService.create_session(
+                schema.load(request.get_json())
+            )
+        except ValidationError as ex:
+            abort(400, ex)
+        except ServiceException as ex:
+            abort(500, ex)
+        else:
+            return schema.dump(data)
+
+    @app.route('/sessions/<session_id>/', methods=['post'])
+    def query(session_id: str):
+        schema = QuerySchema()
+        try:
+            data = schema.load(request.get_json())
+            data.session_id = session_id
+            data = PrologDService.query(data)
+        except ValidationError as ex:
+            abort(400, ex)
+        except SessionException as ex:
+            abort(404, ex)
+        except ServiceException as ex:
+            abort(500, ex)
+        else:
+            return schema.dump(data)
+
+    @app.route('/sessions/<session_id>/', methods=['delete'])
+    def close_session(session_id: str):
+        try:
+            PrologDService.close_session(session_id)
+        except SessionException as ex:
+            abort(404, ex)
+        return '', 204
     return app
 
 
@@ -0,0 +1,92 @@
+""" Replays workloads captured in the slow executions log
+    against any prologd build and reports latency differences:
+
+    python -m app.replay slow.log [slow.log.1 ...] --prologd ./prologd """
+
+import sys
+import argparse
+import statistics
+from typing import List, Optional
+from app import config
+from app.service import slowlog
+from app.service.main import PrologDService
+
+
+def replay(record: dict, repeat: int = 1) -> dict:
+    walls = []
+    for _ in range(repeat):
+        exec_result = PrologDService._run(
+            stdin=record['stdin'],
+            time_limit=record.get('time_limit'),
+            memory_limit=record.get('memory_limit')
+        )
+        walls.append(exec_result.timing.wall)
+    return {
+        'code_hash': record['code_hash'],
+        'recorded_wall': record['timing']['wall'],
+        'wall': min(walls),
+        'recorded_verdict': record['verdict'],
+        'verdict': PrologDService._get_verdict(exec_result)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m app.replay',
+        description='Replay the slow executions log'
+    )
+    parser.add_argument('paths', nargs='+', help='slow log files')
+    parser.add_argument(
+        '--prologd',
+        default=config.PROLOGD_BIN,
+        help='prologd binary to replay against'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=1,
+        help='runs per record, the fastest one is reported'
+    )
+    args = parser.parse_args(argv)
+    config.PROLOGD_BIN = args.prologd
+
+    rows = []
+    print('code_hash\trecorded\treplay\tdiff\tverdict')
+    for path in args.paths:
+        for record in slowlog.read(path):
+            row = replay(record, repeat=args.repeat)
+            rows.append(row)
+            verdict = row['verdict']
+            if verdict != row['recorded_verdict']:
+                verdict = f"{row['recorded_verdict']} -> {verdict}"
+            print(
+                f"{row['code_hash'][:12]}\t"
+                f"{row['recorded_wall']:.3f}\t"
+                f"{row['wall']:.3f}\t"
+                f"{row['wall'] - row['recorded_wall']:+.3f}\t"
+                f"{verdict}"
+            )
+    if not rows:
+        print('No records')
+        return 0
+    recorded = sum(row['recorded_wall'] for row in rows)
+    replayed = sum(row['wall'] for row in rows)
+    ratios = [
+        row['wall'] / row['recorded_wall']
+        for row in rows if row['recorded_wall'] > 0
+    ]
+    changed = sum(
+        1 for row in rows if row['verdict'] != row['recorded_verdict']
+    )
+    print(
+        f'records: {len(rows)}, '
+        f'recorded: {recorded:.3f}s, '
+        f'replay: {replayed:.3f}s, '
+        f'median ratio: {statistics.median(ratios) if ratios else 0:.3f}, '
+        f'verdict changes: {changed}'
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,23 +1,32 @@
 from typing import Optional
 from marshmallow import Schema, ValidationError
+from marshmallow.validate import Range, Regexp
 from marshmallow.fields import (
     Nested,
     Field,
     Boolean,
     Integer,
+    Float,
+    String,
     Method
 )
 from marshmallow.decorators import (
     post_load,
-    pre_dump
+    pre_dump,
+    post_dump,
+    validates
 )
 from app.entities import (
     DebugData,
     TestData,
-    TestsData
+    TestsData,
+    SuiteData,
+    SessionData,
+    QueryData
 )
 from app.utils import clean_str
 from app.service.exceptions import ServiceException
+from app.service.suites import SuiteStorage
 
 
 class StrField(Field):
@@ -29,6 +38,17 @@ class StrField(Field):
         return clean_str(value)
 
 
+class TimingSchema(Schema):
+
+    queue_wait = Float()
+    spawn = Float()
+    wall = Float()
+    cpu_user = Float()
+    cpu_sys = Float()
+    output_bytes = Integer()
+    checker = Float()
+
+
 class DebugSchema(Schema):
 
     data_in = StrField(
@@ -37,13 +57,31 @@ class DebugSchema(Schema):
         load_only=True
     )
     code = StrField(required=True, load_only=True)
+    time_limit = Float(
+        load_only=True,
+        allow_none=True,
+        validate=Range(min=0, min_inclusive=False)
+    )
+    memory_limit = Integer(
+        load_only=True,
+        allow_none=True,
+        validate=Range(min=1)
+    )
+    with_timing = Boolean(load_only=True, data_key='timing')
     result = StrField(dump_only=True)
     error = StrField(dump_only=True)
+    timing = Nested(TimingSchema, dump_only=True)
 
     @post_load
     def make_debug_data(self, data, **kwargs) -> DebugData:
         return DebugData(**data)
 
+    @post_dump
+    def remove_empty_timing(self, data, **kwargs):
+        if data.get('timing') is None:
+            data.pop('timing', None)
+        return data
+
 
 class TestSchema(Schema):
 
@@ -52,17 +90,39 @@ class TestSchema(Schema):
     result = StrField(dump_only=True)
     error = StrField(dump_only=True)
     ok = Boolean(dump_only=True)
+    timing = Nested(TimingSchema, dump_only=True)
 
     @post_load
     def make_test_data(self, data, **kwargs) -> TestData:
         return TestData(**data)
 
+    @post_dump
+    def remove_empty_timing(self, data, **kwargs):
+        if data.get('timing') is None:
+            data.pop('timing', None)
+        return data
+
 
 class TestsSchema(Schema):
 
     tests = Nested(TestSchema, many=True, required=True)
     checker = StrField(load_only=True, required=True)
     code = StrField(load_only=True, required=True)
+    time_limit = Float(
+        load_only=True,
+        allow_none=True,
+        validate=Range(min=0, min_inclusive=False)
+    )
+    memory_limit = Integer(
+        load_only=True,
+        allow_none=True,
+        validate=Range(min=1)
+    )
+    with_timing = Boolean(load_only=True, data_key='timing')
+    verbosity = String(
+        load_only=True,
+        validate=Regexp(r'^(full|summary|hash|truncate:\d+)$')
+    )
     num = Integer(dump_only=True)
     num_ok = Integer(dump_only=True)
     ok = Boolean(dump_only=True)
@@ -80,6 +140,99 @@ class TestsSchema(Schema):
         data.ok = data.num == data.num_ok
         return data
 
+    @post_dump(pass_original=True)
+    def remove_outputs(self, data, original: TestsData, **kwargs):
+        if original.verbosity == 'summary':
+            for test in data['tests']:
+                test.pop('result', None)
+                test.pop('error', None)
+        return data
+
+
+class SuiteTestsSchema(TestsSchema):
+
+    """ Tests of the registered suite referenced by id """
+
+    class Meta:
+        exclude = ('checker',)
+
+    tests = Nested(TestSchema, many=True, dump_only=True)
+    suite_id = String(load_only=True, required=True)
+
+    @validates('suite_id')
+    def validate_suite_id(self, value: str, **kwargs):
+        if not SuiteStorage.exists(value):
+            raise ValidationError('Unknown suite.')
+
+    @post_load
+    def make_tests_data(self, data, **kwargs) -> TestsData:
+        checker, tests = SuiteStorage.get(data.pop('suite_id'))
+        return TestsData(
+            tests=[
+                TestData(data_in=data_in, data_out=data_out)
+                for data_in, data_out in tests
+            ],
+            checker=checker,
+            **data
+        )
+
+
+class SuiteSchema(Schema):
+
+    id = String(dump_only=True)
+    tests = Nested(TestSchema, many=True, required=True, load_only=True)
+    checker = StrField(required=True, load_only=True)
+
+    @post_load
+    def make_suite_data(self, data, **kwargs) -> SuiteData:
+        return SuiteData(**data)
+
+
+class SessionSchema(Schema):
+
+    id = String(dump_only=True)
+    code = StrField(required=True, load_only=True)
+    time_limit = Float(
+        load_only=True,
+        allow_none=True,
+        validate=Range(min=0, min_inclusive=False)
+    )
+    memory_limit = Integer(
+        load_only=True,
+        allow_none=True,
+        validate=Range(min=1)
+    )
+    cpu_budget = Float(dump_only=True)
+
+    @post_load
+    def make_session_data(self, data, **kwargs) -> SessionData:
+        return SessionData(**data)
+
+
+class QuerySchema(Schema):
+
+    query = StrField(required=True, load_only=True)
+    data_in = StrField(
+        required=False,
+        allow_none=True,
+        load_only=True
+    )
+    with_timing = Boolean(load_only=True, data_key='timing')
+    result = StrField(dump_only=True)
+    error = StrField(dump_only=True)
+    timing = Nested(TimingSchema, dump_only=True)
+    cpu_left = Float(dump_only=True)
+
+    @post_load
+    def make_query_data(self, data, **kwargs) -> QueryData:
+        return QueryData(**data)
+
+    @post_dump
+    def remove_empty_timing(self, data, **kwargs):
+        if data.get('timing') is None:
+            data.pop('timing', None)
+        return data
+
 
 class BadRequestSchema(Schema):
 
@@ -0,0 +1,123 @@
+import re
+from bisect import bisect_right
+from uuid import uuid4
+from typing import Optional, List, Set
+
+
+class BatchProgram:
+
+    """ Program split into clauses and one-line queries,
+        so that clauses are consulted once and queries are run
+        against several inputs in one prologd process.
+
+        Programs with builtins changing the state shared by queries
+        (database, files, random generator, trace mode) are not split """
+
+    _side_effects = re.compile(
+        r'ДОБ|УДАЛ|ЗАПИСЬ_В|ЧТЕНИЕ_ИЗ|СЛУЧ|ТРАССА|ИМПОРТ|ВВКОД|ЖДИ'
+    )
+
+    def __init__(self, clauses: List[str], queries: List[str]):
+        self.clauses = clauses
+        self.queries = queries
+
+    @classmethod
+    def parse(cls, code: str) -> Optional['BatchProgram']:
+
+        """ Split the code without empty lines,
+            return None if the program can not be batched """
+
+        if cls._side_effects.search(code):
+            return None
+        lines = code.split('\n')
+        for i, line in enumerate(lines):
+            if line.startswith('?'):
+                break
+        else:
+            return None
+        clauses, queries = lines[:i], lines[i:]
+        if clauses and not clauses[-1].rstrip().endswith('.'):
+            return None
+        for query in queries:
+            if not query.startswith('?') or not query.rstrip().endswith('.'):
+                return None
+        return cls(clauses=clauses, queries=queries)
+
+
+class Batch:
+
+    """ Stdin of prologd running the program against several inputs.
+
+        Every input is followed by queries of the program, then queries
+        reading the rest of the input, if the program have not read it,
+        and the query printing the separator token. Output of the input
+        is the stdout before the separator, errors are attributed to
+        inputs by the line number prefix. """
+
+    # answer of prologd to the separator query
+    _answer = '\nДА\n'
+    _drain_query = '?ТИХО,ВВОДСТР(Х).'
+    _error_line = re.compile(r'^(\d+) ')
+
+    def __init__(self, program: BatchProgram, inputs: List[Optional[str]]):
+        self.token = f'#{uuid4().hex}#'
+        lines = list(program.clauses)
+        # first line, first drain line and separator line of every input
+        self._starts = []
+        self._drains = []
+        self._separators = []
+        for data_in in inputs:
+            input_lines = [
+                f'${line}' for line in data_in.strip().split('\n')
+            ] if data_in else []
+            self._starts.append(len(lines) + 1)
+            lines.extend(input_lines)
+            lines.extend(program.queries)
+            self._drains.append(len(lines) + 1)
+            lines.extend([self._drain_query] * len(input_lines))
+            lines.append(f'?ВЫВОД("{self.token}").')
+            self._separators.append(len(lines))
+        self.stdin = '\n'.join(lines)
+        self._buffer = ''
+        self.broken = False
+
+    def feed(self, output: str) -> List[str]:
+
+        """ Add the next chunk of stdout,
+            return outputs of inputs completed by it """
+
+        self._buffer += output
+        outputs = []
+        while not self.broken:
+            index = self._buffer.find(self.token)
+            if index < 0:
+                break
+            rest = self._buffer[index + len(self.token):]
+            if len(rest) < len(self._answer):
+                break
+            if not rest.startswith(self._answer):
+                self.broken = True
+                break
+            outputs.append(self._buffer[:index])
+            self._buffer = rest[len(self._answer):]
+        return outputs
+
+    def get_failed(self, error: Optional[str]) -> Optional[Set[int]]:
+
+        """ Indexes of inputs with errors, errors of the drain queries
+            are ignored. None if there are errors outside of inputs """
+
+        failed = set()
+        for line in (error or '').splitlines():
+            if not line:
+                continue
+            match = self._error_line.match(line)
+            if match is None:
+                return None
+            number = int(match.group(1))
+            index = bisect_right(self._starts, number) - 1
+            if index < 0 or number >= self._separators[index]:
+                return None
+            if number < self._drains[index]:
+                failed.add(index)
+        return failed
@@ -0,0 +1,202 @@
+import os
+import re
+import json
+import time
+import shutil
+import sqlite3
+import hashlib
+import threading
+from dataclasses import asdict
+from typing import Optional, Tuple
+from app import config
+from app.entities import TimingData
+from app.service import metrics
+from app.service.entities import ExecuteResult
+from app.service.library import ImportLibrary
+
+
+class ResultCache:
+
+    """ Results of executions shared by all workers of the node
+        and kept across restarts in the SQLite database in WAL mode,
+        so that reads do not block each other and the writer.
+
+        Results are keyed on the normalized program and input, memory limit,
+        prologd binary and import library versions. Least recently used
+        results are evicted when the database exceeds RESULT_CACHE_MAX_BYTES.
+        Any database error is counted and treated as a miss """
+
+    # programs which results depend on anything but the input
+    _nondeterministic = re.compile(r'СЛУЧ|ЗАПИСЬ_В|ЧТЕНИЕ_ИЗ')
+    _local = threading.local()
+    _lock = threading.Lock()
+    _prologd: Optional[Tuple] = None
+    _puts = 0
+
+    @classmethod
+    def _connect(cls) -> sqlite3.Connection:
+        connection = getattr(cls._local, 'connection', None)
+        if connection is not None and (
+            cls._local.pid == os.getpid()
+            and cls._local.path == config.RESULT_CACHE_PATH
+        ):
+            return connection
+        connection = sqlite3.connect(
+            config.RESULT_CACHE_PATH,
+            timeout=config.RESULT_CACHE_BUSY_TIMEOUT,
+            isolation_level=None
+        )
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'key BLOB PRIMARY KEY, '
+            'value TEXT NOT NULL, '
+            'used_at REAL NOT NULL'
+            ') WITHOUT ROWID'
+        )
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS results_used_at ON results (used_at)'
+        )
+        cls._local.connection = connection
+        cls._local.pid = os.getpid()
+        cls._local.path = config.RESULT_CACHE_PATH
+        return connection
+
+    @classmethod
+    def _get_prologd_version(cls) -> Optional[str]:
+
+        """ Content hash of the prologd binary,
+            computed again only if the file is changed """
+
+        path = shutil.which(config.PROLOGD_BIN)
+        if path is None:
+            return None
+        stat = os.stat(path)
+        fingerprint = (path, stat.st_size, stat.st_mtime_ns)
+        prologd = cls._prologd
+        if prologd is None or prologd[0] != fingerprint:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            prologd = (fingerprint, digest.hexdigest())
+            cls._prologd = prologd
+        return prologd[1]
+
+    @classmethod
+    def get_key(
+        cls,
+        code: str,
+        data_in: Optional[str] = None,
+        memory_limit: Optional[int] = None
+    ) -> Optional[bytes]:
+
+        """ Key of the execution, None if the cache is disabled
+            or the result of the execution should not be cached """
+
+        if not config.RESULT_CACHE_PATH or cls._nondeterministic.search(code):
+            return None
+        library = ImportLibrary.get_version()
+        if library is None and os.path.isdir(config.IMPORT_DIR):
+            # the library is used without snapshot and could change
+            return None
+        prologd = cls._get_prologd_version()
+        if prologd is None:
+            return None
+        digest = hashlib.sha256()
+        digest.update(f'{prologd}\0{library}\0{memory_limit}\0'.encode())
+        digest.update(code.encode())
+        if data_in:
+            digest.update(b'\0')
+            digest.update(data_in.strip().encode())
+        return digest.digest()
+
+    @classmethod
+    def get(cls, key: bytes, time_limit: float) -> Optional[ExecuteResult]:
+
+        """ Cached result if it was got within the time limit """
+
+        try:
+            connection = cls._connect()
+            row = connection.execute(
+                'SELECT value, used_at FROM results WHERE key = ?',
+                (key,)
+            ).fetchone()
+            if row is None:
+                metrics.incr('result_cache_misses')
+                return None
+            value = json.loads(row[0])
+            now = time.time()
+            # the time of use is updated coarsely to keep reads cheap
+            if now - row[1] >= config.RESULT_CACHE_TOUCH_INTERVAL:
+                connection.execute(
+                    'UPDATE results SET used_at = ? WHERE key = ?',
+                    (now, key)
+                )
+        except sqlite3.Error:
+            metrics.incr('result_cache_errors')
+            return None
+        timing = TimingData(**value['timing'])
+        if timing.wall > time_limit:
+            metrics.incr('result_cache_misses')
+            return None
+        metrics.incr('result_cache_hits')
+        return ExecuteResult(
+            result=value['result'],
+            error=value['error'],
+            timing=timing
+        )
+
+    @classmethod
+    def put(cls, key: bytes, exec_result: ExecuteResult):
+        if exec_result.timeout:
+            return
+        timing = TimingData(
+            wall=exec_result.timing.wall,
+            cpu_user=exec_result.timing.cpu_user,
+            cpu_sys=exec_result.timing.cpu_sys,
+            output_bytes=exec_result.timing.output_bytes
+        )
+        value = json.dumps(
+            {
+                'result': exec_result.result,
+                'error': exec_result.error,
+                'timing': asdict(timing)
+            },
+            ensure_ascii=False
+        )
+        try:
+            connection = cls._connect()
+            connection.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?)',
+                (key, value, time.time())
+            )
+            with cls._lock:
+                cls._puts += 1
+                evict = cls._puts % config.RESULT_CACHE_EVICT_INTERVAL == 0
+            if evict:
+                cls._evict(connection)
+        except sqlite3.Error:
+            metrics.incr('result_cache_errors')
+
+    @classmethod
+    def _evict(cls, connection: sqlite3.Connection):
+
+        """ Remove the least recently used tenth of results
+            if the database exceeds the size limit """
+
+        page_size, = connection.execute('PRAGMA page_size').fetchone()
+        page_count, = connection.execute('PRAGMA page_count').fetchone()
+        free_count, = connection.execute('PRAGMA freelist_count').fetchone()
+        if (page_count - free_count) * page_size <= (
+            config.RESULT_CACHE_MAX_BYTES
+        ):
+            return
+        connection.execute(
+            'DELETE FROM results WHERE key IN ('
+            'SELECT key FROM results ORDER BY used_at LIMIT '
+            '(SELECT COUNT(*) / 10 + 1 FROM results)'
+            ')'
+        )
+        metrics.incr('result_cache_evictions')
@@ -0,0 +1,70 @@
+import time
+from threading import Lock, Event
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class Flight:
+
+    """ Execution in progress shared by callers with the same key """
+
+    def __init__(self, time_limit: float):
+        self.time_limit = time_limit
+        self.started: Optional[float] = None
+        self.result: Any = None
+        self.exception: Optional[Exception] = None
+        self._done = Event()
+
+    def start(self):
+        self.started = time.monotonic()
+
+    def finish(self, result: Any = None, exception: Optional[Exception] = None):
+        self.result = result
+        self.exception = exception
+        self._done.set()
+
+    def wait(self, time_limit: float, grace: float) -> bool:
+
+        """ Wait for the result no longer than time_limit
+            after the start of the execution, False on deadline """
+
+        while True:
+            if self.started is None:
+                if self._done.wait(grace):
+                    return True
+                continue
+            remaining = self.started + time_limit + grace - time.monotonic()
+            if remaining <= 0:
+                return self._done.is_set()
+            if self._done.wait(remaining):
+                return True
+
+
+class SingleFlight:
+
+    """ Concurrent executions with the same key run only once,
+        the caller joins the execution in progress if its time limit
+        is not less than own one, otherwise it runs separately """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._flights: Dict[Hashable, Flight] = {}
+
+    def join(self, key: Hashable, time_limit: float) -> Tuple[Flight, bool]:
+
+        """ Return the flight and whether the caller is its leader """
+
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and flight.time_limit >= time_limit:
+                return flight, False
+            flight = Flight(time_limit)
+            self._flights.setdefault(key, flight)
+            return flight, True
+
+    def leave(self, key: Hashable, flight: Flight):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def __len__(self):
+        return len(self._flights)
@@ -1,3 +1,12 @@
 from collections import namedtuple
 
-ExecuteResult = namedtuple('ExecuteResult', ('result', 'error'))
+ExecuteResult = namedtuple(
+    'ExecuteResult',
+    ('result', 'error', 'timing', 'timeout'),
+    defaults=(None, False)
+)
+
+InputFile = namedtuple(
+    'InputFile',
+    ('fd', 'digest', 'lines', 'size')
+)
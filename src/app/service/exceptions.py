@@ -24,3 +24,8 @@ class CheckerException(ServiceException):
 class ExecutionException(ServiceException):
 
     default_message = messages.MSG_6
+
+
+class SessionException(ServiceException):
+
+    default_message = messages.MSG_8
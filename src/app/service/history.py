@@ -0,0 +1,44 @@
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+
+class RuntimeHistory:
+
+    """ Bounded LRU map of (code, data_in) to the smoothed run time.
+        Keys are short digests, so the entry costs tens of bytes
+        regardless of the program and input size """
+
+    def __init__(self, size: int, alpha: float = 0.5):
+        self.size = size
+        self.alpha = alpha
+        self._items = OrderedDict()
+        self._lock = Lock()
+
+    @classmethod
+    def get_digest(cls, value: Optional[str]) -> bytes:
+        return hashlib.blake2b(
+            (value or '').encode(),
+            digest_size=8
+        ).digest()
+
+    @classmethod
+    def get_key(cls, code_digest: bytes, data_in: Optional[str]) -> bytes:
+        return code_digest + cls.get_digest(data_in)
+
+    def get(self, key: bytes) -> Optional[float]:
+        with self._lock:
+            return self._items.get(key)
+
+    def update(self, key: bytes, wall: float):
+        with self._lock:
+            value = self._items.pop(key, None)
+            if value is not None:
+                wall = self.alpha * wall + (1 - self.alpha) * value
+            self._items[key] = wall
+            if len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
@@ -0,0 +1,127 @@
+import os
+import hashlib
+from collections import OrderedDict, Counter
+from contextlib import contextmanager
+from threading import Lock
+from typing import Optional, Iterator
+from app import config
+from app.service.entities import InputFile
+
+
+class InputCache:
+
+    """ Large inputs of tests encoded once into anonymous RAM-backed
+        files (memfd) which are passed to prologd with -i option,
+        so the input is not rebuilt and copied through the pipe per run.
+
+        Files are kept by the input string in LRU order within
+        INPUT_CACHE_MAX_BYTES. Evicted files still used by running
+        processes are closed when the last of them releases the file """
+
+    _lock = Lock()
+    _files: 'OrderedDict[str, InputFile]' = OrderedDict()
+    _refs = Counter()
+    _evicted = set()
+    _size = 0
+
+    @classmethod
+    def is_enabled(cls, data_in: Optional[str]) -> bool:
+        return (
+            hasattr(os, 'memfd_create')
+            and data_in is not None
+            and len(data_in) >= config.INPUT_FILE_THRESHOLD
+            and not data_in.isspace()
+        )
+
+    @classmethod
+    def _create(cls, data_in: str) -> InputFile:
+        content = data_in.strip().encode()
+        fd = os.memfd_create('prologd-input', os.MFD_CLOEXEC)
+        try:
+            view = memoryview(content)
+            while view:
+                view = view[os.write(fd, view):]
+        except Exception:
+            os.close(fd)
+            raise
+        return InputFile(
+            fd=fd,
+            digest=hashlib.blake2b(content, digest_size=16).digest(),
+            lines=content.count(b'\n') + 1,
+            size=len(content)
+        )
+
+    @classmethod
+    def _close(cls, fd: int):
+        cls._evicted.discard(fd)
+        os.close(fd)
+
+    @classmethod
+    def _evict(cls):
+        while cls._size > config.INPUT_CACHE_MAX_BYTES and cls._files:
+            _, input_file = cls._files.popitem(last=False)
+            cls._size -= input_file.size
+            if cls._refs[input_file.fd]:
+                cls._evicted.add(input_file.fd)
+            else:
+                cls._close(input_file.fd)
+
+    @classmethod
+    def _acquire(cls, data_in: str) -> InputFile:
+        with cls._lock:
+            input_file = cls._files.get(data_in)
+            if input_file is not None:
+                cls._files.move_to_end(data_in)
+                cls._refs[input_file.fd] += 1
+                return input_file
+        created = cls._create(data_in)
+        with cls._lock:
+            # the same input could be created by another thread meanwhile
+            input_file = cls._files.get(data_in)
+            if input_file is None:
+                input_file = created
+                cls._files[data_in] = input_file
+                cls._size += input_file.size
+            cls._refs[input_file.fd] += 1
+            cls._evict()
+        if input_file is not created:
+            os.close(created.fd)
+        return input_file
+
+    @classmethod
+    def _release(cls, input_file: InputFile):
+        with cls._lock:
+            cls._refs[input_file.fd] -= 1
+            if cls._refs[input_file.fd] <= 0:
+                del cls._refs[input_file.fd]
+                if input_file.fd in cls._evicted:
+                    cls._close(input_file.fd)
+
+    @classmethod
+    @contextmanager
+    def open(cls, data_in: str) -> Iterator[InputFile]:
+
+        """ Input file with the stripped data_in,
+            kept open while the context is active """
+
+        input_file = cls._acquire(data_in)
+        try:
+            yield input_file
+        finally:
+            cls._release(input_file)
+
+    @classmethod
+    def get_path(cls, input_file: InputFile) -> str:
+        # prologd opens the file by itself, so it reads from the beginning
+        return f'/dev/fd/{input_file.fd}'
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            for input_file in cls._files.values():
+                if cls._refs[input_file.fd]:
+                    cls._evicted.add(input_file.fd)
+                else:
+                    cls._close(input_file.fd)
+            cls._files.clear()
+            cls._size = 0
@@ -0,0 +1,149 @@
+import os
+import time
+import shutil
+import hashlib
+import tempfile
+from threading import Lock
+from typing import Optional, Dict, Tuple
+from app import config
+
+
+class ImportLibrary:
+
+    """ Snapshot of the import library (-d option of prologd)
+        in the RAM-backed directory.
+
+        Source directory is polled for changes at most once
+        per IMPORT_CHECK_INTERVAL seconds. Changed library is copied
+        into the new snapshot named by content hash and swapped in,
+        retired snapshots are removed after IMPORT_SNAPSHOT_TTL seconds,
+        so that in-flight runs keep their files. """
+
+    _lock = Lock()
+    _root: Optional[str] = None
+    _version: Optional[str] = None
+    _fingerprint: Optional[Tuple] = None
+    _checked_at: Optional[float] = None
+    _retired: Dict[str, float] = {}
+
+    @classmethod
+    def _get_fingerprint(cls) -> Optional[Tuple]:
+        if not os.path.isdir(config.IMPORT_DIR):
+            return None
+        items = []
+        for dirpath, dirnames, filenames in os.walk(config.IMPORT_DIR):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(dirpath, filename)
+                stat = os.stat(path)
+                items.append((path, stat.st_size, stat.st_mtime_ns))
+        return tuple(items)
+
+    @classmethod
+    def _copy_tree(cls, target: str) -> str:
+
+        """ Copy source library into the target directory,
+            validate copied files and return content hash """
+
+        digest = hashlib.sha256()
+        for dirpath, dirnames, filenames in os.walk(config.IMPORT_DIR):
+            dirnames.sort()
+            relpath = os.path.relpath(dirpath, config.IMPORT_DIR)
+            target_dir = os.path.normpath(os.path.join(target, relpath))
+            os.makedirs(target_dir, mode=0o755, exist_ok=True)
+            for filename in sorted(filenames):
+                with open(os.path.join(dirpath, filename), 'rb') as f:
+                    content = f.read()
+                target_path = os.path.join(target_dir, filename)
+                with open(target_path, 'wb') as f:
+                    f.write(content)
+                os.chmod(target_path, 0o644)
+                with open(target_path, 'rb') as f:
+                    if f.read() != content:
+                        raise OSError(f'Snapshot validation failed: {target_path}')
+                digest.update(os.path.join(relpath, filename).encode())
+                digest.update(b'\0')
+                digest.update(hashlib.sha256(content).digest())
+        return digest.hexdigest()[:16]
+
+    @classmethod
+    def _make_snapshot(cls) -> Tuple[str, str]:
+        os.makedirs(config.IMPORT_SNAPSHOT_DIR, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix='.tmp-', dir=config.IMPORT_SNAPSHOT_DIR)
+        try:
+            os.chmod(tmp, 0o755)
+            version = cls._copy_tree(tmp)
+            target = os.path.join(config.IMPORT_SNAPSHOT_DIR, version)
+            try:
+                os.rename(tmp, target)
+            except OSError:
+                # the same snapshot is already made by another worker
+                if not os.path.isdir(target):
+                    raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return target, version
+
+    @classmethod
+    def _remove_retired(cls):
+        now = time.monotonic()
+        for root, retired_at in list(cls._retired.items()):
+            if root != cls._root and (
+                now - retired_at >= config.IMPORT_SNAPSHOT_TTL
+            ):
+                shutil.rmtree(root, ignore_errors=True)
+                del cls._retired[root]
+
+    @classmethod
+    def refresh(cls):
+
+        """ Make a new snapshot if the source library was changed.
+            On any failure runs use the source directory directly """
+
+        cls._checked_at = time.monotonic()
+        fingerprint = cls._get_fingerprint()
+        if (
+            fingerprint == cls._fingerprint
+            and cls._root is not None
+            and os.path.isdir(cls._root)
+        ):
+            cls._remove_retired()
+            return
+        root, version = config.IMPORT_DIR, None
+        if fingerprint is not None and config.IMPORT_SNAPSHOT_DIR:
+            try:
+                root, version = cls._make_snapshot()
+            except OSError:
+                root, version = config.IMPORT_DIR, None
+        if cls._root and cls._root != root and cls._version:
+            cls._retired[cls._root] = time.monotonic()
+        cls._root, cls._version = root, version
+        cls._fingerprint = fingerprint
+        cls._remove_retired()
+
+    @classmethod
+    def _refresh_if_expired(cls):
+        if cls._checked_at is not None and (
+            time.monotonic() - cls._checked_at < config.IMPORT_CHECK_INTERVAL
+        ):
+            return
+        # runs of other threads keep using the current snapshot
+        if cls._lock.acquire(blocking=cls._root is None):
+            try:
+                cls.refresh()
+            finally:
+                cls._lock.release()
+
+    @classmethod
+    def get_root(cls) -> str:
+        cls._refresh_if_expired()
+        return cls._root
+
+    @classmethod
+    def get_version(cls) -> Optional[str]:
+
+        """ Content hash of the current snapshot,
+            should be the part of any result cache key """
+
+        cls._refresh_if_expired()
+        return cls._version
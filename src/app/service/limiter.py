@@ -0,0 +1,106 @@
+import os
+import time
+from collections import deque
+from threading import Condition
+from typing import Optional
+from app import config
+from app.entities import TimingData
+
+
+class AdaptiveLimiter:
+
+    """ Limit of concurrent prologd runs adjusted by AIMD.
+
+        Every finished run is a sample: the limit is decreased
+        multiplicatively if the run was contended (its wall time
+        exceeds cpu time too much) or the host load average is too high,
+        and increased additively by 1/limit otherwise, i.e. about
+        by one per limit of successful runs. """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int,
+        max_limit: int
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._inflight = 0
+        self._waiting = 0
+        self._decreased_at = 0.0
+        self._cond = Condition()
+        self._history = deque(maxlen=config.CONCURRENCY_HISTORY_SIZE)
+        self._history.append((time.time(), self.limit))
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self) -> float:
+
+        """ Wait for the free slot, return the wait time """
+
+        started = time.monotonic()
+        with self._cond:
+            self._waiting += 1
+            try:
+                while self._inflight >= self.limit:
+                    self._cond.wait()
+            finally:
+                self._waiting -= 1
+            self._inflight += 1
+        return time.monotonic() - started
+
+    def release(self, timing: Optional[TimingData] = None):
+        with self._cond:
+            self._inflight -= 1
+            if timing is not None:
+                self._update(timing)
+            self._cond.notify_all()
+
+    def _is_overloaded(self, timing: TimingData) -> bool:
+        load = os.getloadavg()[0] / (os.cpu_count() or 1)
+        if load > config.CONCURRENCY_LOAD_TOLERANCE:
+            return True
+        if timing.cpu_user is None or timing.cpu_sys is None:
+            return False
+        cpu = timing.cpu_user + timing.cpu_sys
+        if cpu < config.CONCURRENCY_MIN_CPU:
+            return False
+        return timing.wall / cpu > config.CONCURRENCY_SLOWDOWN_TOLERANCE
+
+    def _update(self, timing: TimingData):
+        limit = self.limit
+        if self._is_overloaded(timing):
+            now = time.monotonic()
+            if now - self._decreased_at < config.CONCURRENCY_BACKOFF_INTERVAL:
+                return
+            self._decreased_at = now
+            self._limit = max(
+                self.min_limit,
+                self._limit * config.CONCURRENCY_BACKOFF
+            )
+        else:
+            self._limit = min(
+                self.max_limit,
+                self._limit + 1 / self._limit
+            )
+        if self.limit != limit:
+            self._history.append((time.time(), self.limit))
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {
+                'limit': self.limit,
+                'inflight': self._inflight,
+                'waiting': self._waiting,
+                'history': list(self._history)
+            }
+
+
+limiter = AdaptiveLimiter(
+    initial=config.CONCURRENCY_INITIAL,
+    min_limit=config.CONCURRENCY_MIN,
+    max_limit=config.CONCURRENCY_MAX
+)
@@ -1,27 +1,90 @@
 import os
 import re
+import codecs
+import hashlib
+import selectors
+import signal
+import resource
 import subprocess
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial, lru_cache
+from typing import Optional, Tuple, List, Callable
 from app.entities import (
     DebugData,
-    TestsData
+    TestData,
+    TestsData,
+    TimingData,
+    SuiteData,
+    SessionData,
+    QueryData
 )
 from app import config
 from app.service import exceptions
-from app.service.entities import ExecuteResult
+from app.service.entities import ExecuteResult, InputFile
 from app.service import messages
+from app.service import metrics
+from app.service import slowlog
+from app.service import precheck
+from app.service.batch import Batch, BatchProgram
+from app.service.cache import ResultCache
+from app.service.coalescing import Flight, SingleFlight
+from app.service.history import RuntimeHistory
+from app.service.inputs import InputCache
+from app.service.library import ImportLibrary
+from app.service.limiter import limiter
+from app.service.process import SandboxProcess
+from app.service.sessions import Session, SessionStorage
+from app.service.suites import SuiteStorage
 from app.utils import clean_str
 
 
 class PrologDService:
 
+    # tests of the suite are run concurrently, number of running
+    # prologd processes is bounded by the adaptive limiter
+    _executor = ThreadPoolExecutor(
+        max_workers=config.CONCURRENCY_MAX,
+        thread_name_prefix='prologd'
+    )
+    # identical concurrent executions share one prologd process
+    _flights = SingleFlight()
+    # run time of tests used to start the longest ones first
+    _history = RuntimeHistory(size=config.RUNTIME_HISTORY_SIZE)
+
     @classmethod
-    def _preexec_fn(cls):
+    def _preexec_fn(cls, memory_limit: Optional[int] = None):
         def change_process_user():
             os.setgid(config.SANDBOX_USER_UID)
             os.setuid(config.SANDBOX_USER_UID)
+        if memory_limit:
+            limit = memory_limit * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
         return change_process_user()
 
+    @classmethod
+    def _get_limits(
+        cls,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None
+    ) -> Tuple[float, Optional[int]]:
+
+        """ Clamp limits requested by the client to server maximums """
+
+        time_limit = min(time_limit or config.TIMEOUT, config.MAX_TIME_LIMIT)
+        if memory_limit:
+            memory_limit = min(memory_limit, config.MAX_MEMORY_LIMIT)
+        return time_limit, memory_limit
+
+    @classmethod
+    @lru_cache(maxsize=config.CODE_CACHE_SIZE)
+    def _get_code(cls, code: str) -> str:
+
+        """ Remove empty lines in code """
+
+        return re.sub(r'(?:[\t ]*(?:\r?\n|\r))+', '\n', code).strip()
+
     @classmethod
     def _get_stdin(
         cls,
@@ -33,49 +96,296 @@ class PrologDService:
             Encode input lines with prefix $
             Then union input and code in one string """
 
-        code = re.sub(r'(?:[\t ]*(?:\r?\n|\r))+', '\n', code)
+        code = cls._get_code(code)
         if data_in:
             stdin = '$' + data_in.strip()
             if stdin.find('\n') > 0:
                 stdin = stdin.replace('\n', '\n$')
-            return f'{stdin}\n{code.strip()}'
+            return f'{stdin}\n{code}'
         else:
-            return code.strip()
+            return code
 
     @classmethod
-    def _execute(
+    def _shift_error_lines(
         cls,
-        code: str,
-        data_in: Optional[str] = None
+        error: Optional[str],
+        offset: int
+    ) -> Optional[str]:
+
+        """ prologd prefixes errors with the line number of stdin,
+            which includes encoded input lines if input is passed in stdin """
+
+        if not error:
+            return error
+        return re.sub(
+            r'^\d+(?= )',
+            lambda match: str(int(match.group()) + offset),
+            error,
+            flags=re.MULTILINE
+        )
+
+    @classmethod
+    def _kill(cls, proc: SandboxProcess):
+
+        """ Kill the whole process group of the sandbox.
+            Exit status is reaped by the Popen context manager """
+
+        # poll() would reap the process without its resource usage
+        running = proc.returncode is None
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            return
+        if running:
+            metrics.incr('killed_processes')
+        else:
+            metrics.incr('leaked_processes')
+
+    @classmethod
+    def _get_import_dir(cls) -> str:
+        return os.path.join(ImportLibrary.get_root(), 'pld')
+
+    @classmethod
+    def _run(
+        cls,
+        stdin: str,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+        input_file: Optional[InputFile] = None
     ) -> ExecuteResult:
 
-        """ Передает компилятору код программы и входные данные
-            возвращает результат работы программы, либо ошибку компиляции """
+        """ Запускает prologd с подготовленным stdin,
+            возвращает результат и замеры времени выполнения """
 
-        proc = subprocess.Popen(
-            args=['prologd', '-d=import/pld'],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            preexec_fn=cls._preexec_fn,
-            text=True
+        time_limit = time_limit or config.TIMEOUT
+        import_dir = cls._get_import_dir()
+        args = [config.PROLOGD_BIN, f'-d={import_dir}']
+        pass_fds = ()
+        if input_file is not None:
+            args.append(f'-i={InputCache.get_path(input_file)}')
+            pass_fds = (input_file.fd,)
+        key = (
+            stdin,
+            input_file and input_file.digest,
+            memory_limit,
+            config.PROLOGD_BIN,
+            import_dir
         )
+        flight, leader = cls._flights.join(key, time_limit)
+        if not leader:
+            metrics.incr('coalesced_executions')
+            return cls._wait_flight(flight, time_limit)
+
+        queue_wait = limiter.acquire()
+        exec_result = timing = exception = None
         try:
-            result, error = proc.communicate(
-                input=cls._get_stdin(data_in=data_in, code=code),
-                timeout=config.TIMEOUT
+            flight.start()
+            exec_result = cls._spawn_and_communicate(
+                args=args,
+                stdin=stdin,
+                time_limit=time_limit,
+                memory_limit=memory_limit,
+                pass_fds=pass_fds
             )
-        except subprocess.TimeoutExpired:
-            result, error = None, messages.MSG_1
+            timing = exec_result.timing
+            timing.queue_wait = queue_wait
         except Exception as ex:
-            raise exceptions.ExecutionException(details=str(ex))
+            exception = ex
+            raise
         finally:
-            proc.kill()
+            limiter.release(timing)
+            cls._flights.leave(key, flight)
+            flight.finish(result=exec_result, exception=exception)
+        return exec_result
+
+    @classmethod
+    def _wait_flight(cls, flight: Flight, time_limit: float) -> ExecuteResult:
+
+        """ Result of the identical execution in progress,
+            checked against own time limit of the caller """
+
+        joined = time.monotonic()
+        if flight.wait(time_limit, grace=config.COALESCING_GRACE):
+            if flight.exception is not None:
+                raise flight.exception
+            exec_result = flight.result
+            if not exec_result.timeout and (
+                exec_result.timing.wall <= time_limit
+            ):
+                return exec_result._replace(
+                    timing=replace(
+                        exec_result.timing,
+                        queue_wait=time.monotonic() - joined
+                    )
+                )
+        return ExecuteResult(
+            result=None,
+            error=messages.MSG_1.format(time_limit),
+            timing=TimingData(queue_wait=time.monotonic() - joined),
+            timeout=True
+        )
+
+    @classmethod
+    def _spawn(
+        cls,
+        args: list,
+        memory_limit: Optional[int] = None,
+        pass_fds: tuple = ()
+    ) -> SandboxProcess:
+        return SandboxProcess(
+            args=args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            preexec_fn=partial(cls._preexec_fn, memory_limit=memory_limit),
+            start_new_session=True,
+            pass_fds=pass_fds,
+            text=True
+        )
+
+    @classmethod
+    def _communicate(
+        cls,
+        proc: SandboxProcess,
+        stdin: str,
+        time_limit: float,
+        memory_limit: Optional[int] = None,
+        spawn: float = 0
+    ) -> ExecuteResult:
+
+        """ Pass the rest of stdin to the spawned process and wait
+            for the result, the process group is killed afterwards """
+
+        started = time.monotonic()
+        output_bytes = 0
+        timeout = False
+        with proc:
+            try:
+                result, error = proc.communicate(
+                    input=stdin,
+                    timeout=time_limit
+                )
+                output_bytes = len(result.encode()) + len(error.encode())
+            except subprocess.TimeoutExpired:
+                result, error = None, messages.MSG_1.format(time_limit)
+                timeout = True
+            except Exception as ex:
+                raise exceptions.ExecutionException(details=str(ex))
+            finally:
+                cls._kill(proc)
+        timing = TimingData(
+            spawn=spawn,
+            wall=time.monotonic() - started,
+            output_bytes=output_bytes
+        )
+        if proc.rusage is not None:
+            timing.cpu_user = proc.rusage.ru_utime
+            timing.cpu_sys = proc.rusage.ru_stime
+        if memory_limit and error and 'std::bad_alloc' in error:
+            error = messages.MSG_7.format(memory_limit)
         return ExecuteResult(
             result=clean_str(result or None),
-            error=clean_str(error or None)
+            error=clean_str(error or None),
+            timing=timing,
+            timeout=timeout
+        )
+
+    @classmethod
+    def _spawn_and_communicate(
+        cls,
+        args: list,
+        stdin: str,
+        time_limit: float,
+        memory_limit: Optional[int] = None,
+        pass_fds: tuple = ()
+    ) -> ExecuteResult:
+        started = time.monotonic()
+        proc = cls._spawn(
+            args=args,
+            memory_limit=memory_limit,
+            pass_fds=pass_fds
+        )
+        return cls._communicate(
+            proc=proc,
+            stdin=stdin,
+            time_limit=time_limit,
+            memory_limit=memory_limit,
+            spawn=time.monotonic() - started
         )
 
+    @classmethod
+    def _get_verdict(cls, exec_result: ExecuteResult) -> str:
+        if exec_result.timeout:
+            return 'timeout'
+        elif exec_result.error:
+            return 'error'
+        return 'ok'
+
+    @classmethod
+    def _execute(
+        cls,
+        code: str,
+        data_in: Optional[str] = None,
+        time_limit: Optional[float] = None,
+        memory_limit: Optional[int] = None
+    ) -> ExecuteResult:
+
+        """ Передает компилятору код программы и входные данные
+            возвращает результат работы программы, либо ошибку компиляции """
+
+        if precheck.is_silent(cls._get_code(code)):
+            # prologd would print nothing, e.g. the program has no goals
+            metrics.incr('skipped_executions')
+            return ExecuteResult(result=None, error=None, timing=TimingData())
+        time_limit, memory_limit = cls._get_limits(time_limit, memory_limit)
+        cache_key = ResultCache.get_key(
+            code=cls._get_code(code),
+            data_in=data_in,
+            memory_limit=memory_limit
+        )
+        if cache_key is not None:
+            exec_result = ResultCache.get(cache_key, time_limit)
+            if exec_result is not None:
+                return exec_result
+        if InputCache.is_enabled(data_in):
+            # large input is passed as the file, stdin contains code only
+            with InputCache.open(data_in) as input_file:
+                exec_result = cls._run(
+                    stdin=cls._get_code(code),
+                    time_limit=time_limit,
+                    memory_limit=memory_limit,
+                    input_file=input_file
+                )
+            exec_result = exec_result._replace(
+                error=cls._shift_error_lines(
+                    exec_result.error,
+                    offset=input_file.lines
+                )
+            )
+            stdin = None
+        else:
+            stdin = cls._get_stdin(data_in=data_in, code=code)
+            exec_result = cls._run(
+                stdin=stdin,
+                time_limit=time_limit,
+                memory_limit=memory_limit
+            )
+        if stdin is None and slowlog.is_slow(exec_result.timing):
+            # slow log keeps stdin to replay the run
+            stdin = cls._get_stdin(data_in=data_in, code=code)
+        slowlog.write(
+            code=code,
+            stdin=stdin,
+            timing=exec_result.timing,
+            verdict=cls._get_verdict(exec_result),
+            time_limit=time_limit,
+            memory_limit=memory_limit,
+            library=ImportLibrary.get_version()
+        )
+        if cache_key is not None:
+            ResultCache.put(cache_key, exec_result)
+        return exec_result
+
     @classmethod
     def _validate_checker_func(cls, checker_func: str):
         if not checker_func.startswith(
@@ -86,13 +396,29 @@ class PrologDService:
             raise exceptions.CheckerException(messages.MSG_3)
 
     @classmethod
-    def _check(cls, checker_func: str, **checker_func_vars) -> bool:
+    @lru_cache(maxsize=config.CHECKERS_CACHE_SIZE)
+    def _get_checker(cls, checker_func: str) -> Callable[[str, str], bool]:
+
+        """ Validate and compile the checker once per its source """
+
         cls._validate_checker_func(checker_func)
+        checker_func_vars = {}
         try:
-            exec(
-                checker_func + '\nresult = checker(right_value, value)',
-                globals(),
-                checker_func_vars
+            exec(checker_func, globals(), checker_func_vars)
+        except Exception as ex:
+            raise exceptions.CheckerException(
+                message=messages.MSG_5,
+                details=str(ex)
+            )
+        return checker_func_vars['checker']
+
+    @classmethod
+    def _check(cls, checker_func: str, **checker_func_vars) -> bool:
+        checker = cls._get_checker(checker_func)
+        try:
+            result = checker(
+                checker_func_vars['right_value'],
+                checker_func_vars['value']
             )
         except Exception as ex:
             raise exceptions.CheckerException(
@@ -100,7 +426,6 @@ class PrologDService:
                 details=str(ex)
             )
         else:
-            result = checker_func_vars['result']
             if not isinstance(result, bool):
                 raise exceptions.CheckerException(messages.MSG_4)
             return result
@@ -109,24 +434,405 @@ class PrologDService:
     def debug(cls, data: DebugData) -> DebugData:
         exec_result = cls._execute(
             code=data.code,
-            data_in=data.data_in
+            data_in=data.data_in,
+            time_limit=data.time_limit,
+            memory_limit=data.memory_limit
         )
         data.result = exec_result.result
         data.error = exec_result.error
+        if data.with_timing:
+            data.timing = exec_result.timing
         return data
 
+    @classmethod
+    def _finish_test(
+        cls,
+        data: TestsData,
+        test: TestData,
+        exec_result: ExecuteResult,
+        history_key: bytes,
+        queue_wait: float
+    ):
+        if exec_result.timing is not None:
+            cls._history.update(history_key, exec_result.timing.wall)
+        checker_started = time.monotonic()
+        test.ok = cls._check(
+            checker_func=data.checker,
+            right_value=test.data_out,
+            value=exec_result.result
+        )
+        # only compacted outputs are kept until the response
+        test.result = cls._compact_output(exec_result.result, data.verbosity)
+        test.error = cls._compact_output(exec_result.error, data.verbosity)
+        if data.with_timing:
+            test.timing = replace(
+                exec_result.timing,
+                queue_wait=queue_wait + exec_result.timing.queue_wait,
+                checker=time.monotonic() - checker_started
+            )
+
+    @classmethod
+    def _run_test(
+        cls,
+        data: TestsData,
+        test: TestData,
+        history_key: bytes,
+        submitted: float
+    ):
+        queue_wait = time.monotonic() - submitted
+        exec_result = cls._execute(
+            code=data.code,
+            data_in=test.data_in,
+            time_limit=data.time_limit,
+            memory_limit=data.memory_limit
+        )
+        cls._finish_test(data, test, exec_result, history_key, queue_wait)
+
+    @classmethod
+    def _communicate_batch(
+        cls,
+        proc: SandboxProcess,
+        batch: Batch,
+        time_limit: float
+    ) -> Tuple[List[ExecuteResult], str]:
+
+        """ Pass the batch to the process and read outputs of inputs
+            as they are completed, every input has own time limit """
+
+        results = []
+        errors = []
+        try:
+            proc.stdin.write(batch.stdin)
+            proc.stdin.close()
+        except BrokenPipeError:
+            return results, ''
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        with selectors.DefaultSelector() as selector:
+            selector.register(proc.stdout, selectors.EVENT_READ)
+            selector.register(proc.stderr, selectors.EVENT_READ)
+            started = time.monotonic()
+            while selector.get_map():
+                timeout = started + time_limit - time.monotonic()
+                if timeout <= 0:
+                    break
+                for key, _ in selector.select(timeout):
+                    chunk = os.read(key.fd, 32768)
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                    elif key.fileobj is proc.stderr:
+                        errors.append(chunk)
+                    else:
+                        for output in batch.feed(decoder.decode(chunk)):
+                            now = time.monotonic()
+                            results.append(ExecuteResult(
+                                result=clean_str(output or None),
+                                error=None,
+                                timing=TimingData(
+                                    wall=now - started,
+                                    output_bytes=len(output.encode())
+                                )
+                            ))
+                            started = now
+            if not selector.get_map():
+                proc.wait()
+        # errors of completed inputs written before the time limit
+        cls._kill(proc)
+        while True:
+            chunk = os.read(proc.stderr.fileno(), 32768)
+            if not chunk:
+                break
+            errors.append(chunk)
+        return results, b''.join(errors).decode(errors='replace')
+
+    @classmethod
+    def _run_batch(
+        cls,
+        batch: Batch,
+        time_limit: float,
+        memory_limit: Optional[int] = None
+    ) -> Tuple[List[ExecuteResult], str]:
+
+        """ Run the batch in one prologd process, return results
+            of inputs completed in time and stderr of the process """
+
+        import_dir = cls._get_import_dir()
+        queue_wait = limiter.acquire()
+        timing = None
+        try:
+            started = time.monotonic()
+            proc = cls._spawn(
+                args=[config.PROLOGD_BIN, f'-d={import_dir}'],
+                memory_limit=memory_limit
+            )
+            spawned = time.monotonic()
+            with proc:
+                try:
+                    results, error = cls._communicate_batch(
+                        proc=proc,
+                        batch=batch,
+                        time_limit=time_limit
+                    )
+                except Exception as ex:
+                    cls._kill(proc)
+                    raise exceptions.ExecutionException(details=str(ex))
+            timing = TimingData(
+                queue_wait=queue_wait,
+                spawn=spawned - started,
+                wall=time.monotonic() - spawned
+            )
+            if proc.rusage is not None:
+                timing.cpu_user = proc.rusage.ru_utime
+                timing.cpu_sys = proc.rusage.ru_stime
+        finally:
+            limiter.release(timing)
+        for exec_result in results:
+            exec_result.timing.queue_wait = queue_wait
+        if results:
+            results[0].timing.spawn = timing.spawn
+        return results, error
+
+    @classmethod
+    def _run_batch_tests(
+        cls,
+        data: TestsData,
+        program: BatchProgram,
+        indexes: List[int],
+        history_keys: List[bytes],
+        submitted: float
+    ):
+
+        """ Run tests in one process, tests with errors and tests
+            not completed by the process are run in own processes """
+
+        queue_wait = time.monotonic() - submitted
+        time_limit, memory_limit = cls._get_limits(
+            data.time_limit,
+            data.memory_limit
+        )
+        batch = Batch(
+            program=program,
+            inputs=[data.tests[i].data_in for i in indexes]
+        )
+        results, error = cls._run_batch(
+            batch=batch,
+            time_limit=time_limit,
+            memory_limit=memory_limit
+        )
+        failed = batch.get_failed(error)
+        if failed is None:
+            failed, results = set(), []
+        for position, i in enumerate(indexes):
+            if position < len(results) and position not in failed:
+                metrics.incr('batched_tests')
+                cls._finish_test(
+                    data,
+                    data.tests[i],
+                    results[position],
+                    history_keys[i],
+                    queue_wait
+                )
+            else:
+                metrics.incr('batch_fallback_tests')
+                cls._run_test(data, data.tests[i], history_keys[i], submitted)
+
+    @classmethod
+    def _is_batchable(cls, test: TestData, expected: Optional[float]) -> bool:
+        if expected is not None and expected > config.BATCH_MAX_TEST_TIME:
+            return False
+        # line numbers of errors are known only for \n line endings
+        return test.data_in is None or (
+            '\r' not in test.data_in
+            and not InputCache.is_enabled(test.data_in)
+        )
+
+    @classmethod
+    def _compact_output(
+        cls,
+        value: Optional[str],
+        verbosity: str
+    ) -> Optional[str]:
+
+        """ Output of the test according to the verbosity of the request:
+            full, summary (no output), hash (sha256 hex digest)
+            or truncate:N (first N characters) """
+
+        if value is None or verbosity == 'full':
+            return value
+        elif verbosity == 'summary':
+            return None
+        elif verbosity == 'hash':
+            return hashlib.sha256(value.encode()).hexdigest()
+        mode, _, size = verbosity.partition(':')
+        if mode == 'truncate':
+            return value[:int(size)]
+        return value
+
+    @classmethod
+    def _get_tests_order(cls, history_keys: List[bytes]) -> List[int]:
+
+        """ Indexes of tests ordered by expected run time descending,
+            tests never run before are expected to be the longest """
+
+        expected = [
+            cls._history.get(key) for key in history_keys
+        ]
+        return sorted(
+            range(len(history_keys)),
+            key=lambda i: float('inf') if expected[i] is None else expected[i],
+            reverse=True
+        )
+
     @classmethod
     def testing(cls, data: TestsData) -> TestsData:
-        for test in data.tests:
-            exec_result = cls._execute(
-                code=data.code,
-                data_in=test.data_in
+        submitted = time.monotonic()
+        code_digest = RuntimeHistory.get_digest(data.code)
+        history_keys = [
+            RuntimeHistory.get_key(code_digest, test.data_in)
+            for test in data.tests
+        ]
+        order = cls._get_tests_order(history_keys)
+        batched = []
+        if config.BATCH_SIZE > 1 and len(data.tests) > 1:
+            program = BatchProgram.parse(cls._get_code(data.code))
+            if program is not None:
+                batched = [
+                    i for i in order if cls._is_batchable(
+                        data.tests[i],
+                        cls._history.get(history_keys[i])
+                    )
+                ]
+        if len(batched) < 2:
+            batched = []
+        batched_set = set(batched)
+        single = [i for i in order if i not in batched_set]
+        futures = [
+            cls._executor.submit(
+                cls._run_test,
+                data,
+                data.tests[i],
+                history_keys[i],
+                submitted
+            )
+            for i in single
+        ] + [
+            cls._executor.submit(
+                cls._run_batch_tests,
+                data,
+                program,
+                batched[start:start + config.BATCH_SIZE],
+                history_keys,
+                submitted
             )
-            test.result = exec_result.result
-            test.error = exec_result.error
-            test.ok = cls._check(
-                checker_func=data.checker,
-                right_value=test.data_out,
-                value=test.result
+            for start in range(0, len(batched), config.BATCH_SIZE)
+        ]
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+        return data
+
+    @classmethod
+    def register_suite(cls, data: SuiteData) -> SuiteData:
+        cls._get_checker(data.checker)
+        data.id = SuiteStorage.save(
+            checker=data.checker,
+            tests=[(test.data_in, test.data_out) for test in data.tests]
+        )
+        return data
+
+    @classmethod
+    def _prespawn(cls, session: Session):
+
+        """ Spawn the process for the next query of the session
+            and pass the program to it """
+
+        import_dir = cls._get_import_dir()
+        with session.lock:
+            if session.closed:
+                return
+            proc = cls._spawn(
+                args=[config.PROLOGD_BIN, f'-d={import_dir}'],
+                memory_limit=session.memory_limit
             )
+            try:
+                proc.stdin.write(f'{session.code}\n')
+                proc.stdin.flush()
+            except OSError:
+                # the process will be respawned by the query
+                pass
+            session.set_process(proc, import_dir)
+
+    @classmethod
+    def create_session(cls, data: SessionData) -> SessionData:
+        time_limit, memory_limit = cls._get_limits(
+            data.time_limit,
+            data.memory_limit
+        )
+        session = Session(
+            code=cls._get_code(data.code),
+            time_limit=time_limit,
+            memory_limit=memory_limit
+        )
+        SessionStorage.add(session)
+        cls._prespawn(session)
+        data.id = session.id
+        data.cpu_budget = config.SESSION_CPU_BUDGET
+        return data
+
+    @classmethod
+    def close_session(cls, session_id: str):
+        if SessionStorage.remove(session_id) is None:
+            raise exceptions.SessionException()
+
+    @classmethod
+    def query(cls, data: QueryData) -> QueryData:
+
+        """ Run the query and input against the program of the session,
+            using the process spawned in advance if there is one """
+
+        session = SessionStorage.get(data.session_id)
+        stdin = cls._get_stdin(code=data.query, data_in=data.data_in)
+        with session.lock:
+            if session.closed:
+                raise exceptions.SessionException()
+            import_dir = cls._get_import_dir()
+            queue_wait = limiter.acquire()
+            timing = None
+            try:
+                proc = session.pop_process(import_dir)
+                if proc is not None:
+                    exec_result = cls._communicate(
+                        proc=proc,
+                        stdin=stdin,
+                        time_limit=session.time_limit,
+                        memory_limit=session.memory_limit
+                    )
+                else:
+                    exec_result = cls._spawn_and_communicate(
+                        args=[config.PROLOGD_BIN, f'-d={import_dir}'],
+                        stdin=f'{session.code}\n{stdin}',
+                        time_limit=session.time_limit,
+                        memory_limit=session.memory_limit
+                    )
+                timing = exec_result.timing
+                timing.queue_wait = queue_wait
+            finally:
+                limiter.release(timing)
+            session.cpu_used += (timing.cpu_user or 0) + (timing.cpu_sys or 0)
+            cpu_left = config.SESSION_CPU_BUDGET - session.cpu_used
+        data.result = exec_result.result
+        data.error = exec_result.error
+        if data.with_timing:
+            data.timing = timing
+        data.cpu_left = max(cpu_left, 0)
+        if cpu_left <= 0:
+            SessionStorage.remove(session.id)
+            data.error = '\n'.join(filter(None, (
+                data.error,
+                messages.MSG_10.format(config.SESSION_CPU_BUDGET)
+            )))
+        else:
+            cls._executor.submit(cls._prespawn, session)
         return data
@@ -1,4 +1,4 @@
-MSG_1 = 'Program execution time limit exceeded. Limit 5 seconds!'
+MSG_1 = 'Program execution time limit exceeded. Limit {:g} seconds!'
 MSG_2 = (
     'Checker func should starts with:\n'
     '"def checker(right_value: str, value: str) -> bool:"'
@@ -7,3 +7,7 @@ MSG_3 = 'Checker func has no "return" instruction'
 MSG_4 = 'Checker must return a boolean value'
 MSG_5 = 'Invalid checker call. See details'
 MSG_6 = 'Unexpected error during code execution. See details'
+MSG_7 = 'Program memory limit exceeded. Limit {} megabytes!'
+MSG_8 = 'Session not found or expired'
+MSG_9 = 'Too many sessions, try again later'
+MSG_10 = 'Session CPU time budget exceeded. Budget {:g} seconds!'
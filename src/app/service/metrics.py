@@ -0,0 +1,21 @@
+from collections import Counter
+from threading import Lock
+from typing import Dict
+
+_lock = Lock()
+_counters = Counter()
+
+
+def incr(name: str, value: int = 1):
+    with _lock:
+        _counters[name] += value
+
+
+def get(name: str) -> int:
+    with _lock:
+        return _counters[name]
+
+
+def snapshot() -> Dict[str, int]:
+    with _lock:
+        return dict(_counters)
@@ -0,0 +1,131 @@
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from app import config
+
+Token = Tuple[str, str]
+
+_token_pattern = re.compile(
+    r'(?P<space>\s+)'
+    r'|(?P<name>[^\W\d]\w*)(?P<call>\()?'
+    r'|(?P<number>-?\d+)(?![\w.]\d)'
+    r'|(?P<string>"[^"\\\n]*")'
+    r'|(?P<neck>:-)'
+    r'|(?P<punct>[(),\[\]|.])'
+)
+_max_depth = 50
+
+
+class _NotSilent(Exception):
+    pass
+
+
+def _tokenize(code: str) -> List[Token]:
+    tokens = []
+    position = 0
+    while position < len(code):
+        match = _token_pattern.match(code, position)
+        if match is None:
+            raise _NotSilent()
+        position = match.end()
+        kind = match.lastgroup
+        if kind == 'space':
+            continue
+        elif kind == 'call':
+            name = match.group('name')
+            # single letter names are variables and can not be functors
+            if len(name) < 2:
+                raise _NotSilent()
+            tokens.append(('call', name))
+        elif kind == 'name':
+            tokens.append(('name', match.group('name')))
+        elif kind == 'punct':
+            tokens.append((match.group(), match.group()))
+        else:
+            tokens.append((kind, match.group()))
+    return tokens
+
+
+class _Parser:
+
+    """ Recursive descent parser of the strict subset of clauses syntax """
+
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.position = 0
+
+    def _peek(self) -> Optional[str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][0]
+        return None
+
+    def _expect(self, *kinds: str) -> Token:
+        token = self._peek()
+        if token not in kinds:
+            raise _NotSilent()
+        self.position += 1
+        return self.tokens[self.position - 1]
+
+    def _args(self, depth: int):
+        self._term(depth)
+        while self._peek() == ',':
+            self._expect(',')
+            self._term(depth)
+
+    def _term(self, depth: int):
+        if depth > _max_depth:
+            raise _NotSilent()
+        kind = self._peek()
+        if kind == 'call':
+            self._expect('call')
+            self._args(depth + 1)
+            self._expect(')')
+        elif kind == '[':
+            self._expect('[')
+            if self._peek() != ']':
+                self._args(depth + 1)
+                if self._peek() == '|':
+                    self._expect('|')
+                    self._term(depth + 1)
+            self._expect(']')
+        else:
+            self._expect('name', 'number', 'string')
+
+    def _goal(self, head: bool = False):
+        kind, name = self._expect('call', 'name')
+        # upper case names are builtins, their clauses could be rejected
+        if head and name.isupper():
+            raise _NotSilent()
+        if kind == 'call':
+            self._args(depth=1)
+            self._expect(')')
+        elif len(name) < 2 or not name.isalpha():
+            raise _NotSilent()
+
+    def program(self):
+        while self._peek() is not None:
+            self._goal(head=True)
+            if self._peek() == 'neck':
+                self._expect('neck')
+                self._goal()
+                while self._peek() == ',':
+                    self._expect(',')
+                    self._goal()
+            self._expect('.')
+
+
+@lru_cache(maxsize=config.CODE_CACHE_SIZE)
+def is_silent(code: str) -> bool:
+
+    """ True if prologd would print nothing for the code without empty
+        lines: the code is empty or consists of clauses only.
+
+        Only the strict subset of the syntax is recognized, anything else
+        is considered to print, so that programs are never skipped wrongly
+        and prologd reports errors by itself """
+
+    try:
+        _Parser(_tokenize(code)).program()
+    except _NotSilent:
+        return False
+    return True
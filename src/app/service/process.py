@@ -0,0 +1,21 @@
+import os
+import subprocess
+
+
+class SandboxProcess(subprocess.Popen):
+
+    """ Popen which keeps resource usage of the reaped process """
+
+    rusage = None
+
+    def _try_wait(self, wait_flags):
+        # the same as in Popen, but wait4 also returns resource usage
+        try:
+            (pid, sts, rusage) = os.wait4(self.pid, wait_flags)
+        except ChildProcessError:
+            pid = self.pid
+            sts = 0
+        else:
+            if pid == self.pid:
+                self.rusage = rusage
+        return (pid, sts)
@@ -0,0 +1,147 @@
+import os
+import time
+import signal
+from uuid import uuid4
+from threading import Lock
+from typing import Optional, Dict, List
+from app import config
+from app.service import messages
+from app.service.exceptions import SessionException
+from app.service.process import SandboxProcess
+
+
+class Session:
+
+    """ Program kept by the server between queries of the client.
+
+        prologd reads the whole stdin before execution, so the process
+        can not serve several queries. Instead the process for the next
+        query is spawned in advance and already has the program in stdin,
+        the query only completes it """
+
+    def __init__(
+        self,
+        code: str,
+        time_limit: float,
+        memory_limit: Optional[int] = None
+    ):
+        self.id = uuid4().hex
+        self.code = code
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+        self.cpu_used = 0.0
+        self.used_at = time.monotonic()
+        self.closed = False
+        self.lock = Lock()
+        self._proc: Optional[SandboxProcess] = None
+        self._import_dir: Optional[str] = None
+
+    def is_expired(self, now: float) -> bool:
+        return now - self.used_at >= config.SESSION_IDLE_TIMEOUT
+
+    def set_process(self, proc: SandboxProcess, import_dir: str):
+
+        """ Keep the spawned process for the next query,
+            should be called under the session lock """
+
+        self._discard_process()
+        if self.closed:
+            self._kill(proc)
+        else:
+            self._proc, self._import_dir = proc, import_dir
+
+    def pop_process(self, import_dir: str) -> Optional[SandboxProcess]:
+
+        """ Process spawned in advance if it uses the current import library,
+            should be called under the session lock """
+
+        if self._import_dir != import_dir:
+            self._discard_process()
+        proc, self._proc = self._proc, None
+        return proc
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self._discard_process()
+
+    def _discard_process(self):
+        if self._proc is not None:
+            self._kill(self._proc)
+            self._proc = None
+
+    @classmethod
+    def _kill(cls, proc: SandboxProcess):
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        with proc:
+            proc.wait()
+
+
+class SessionStorage:
+
+    """ Sessions of the worker, idle sessions are closed
+        on access to the storage """
+
+    _lock = Lock()
+    _sessions: Dict[str, Session] = {}
+
+    @classmethod
+    def _pop_expired(cls) -> List[Session]:
+        now = time.monotonic()
+        expired = [
+            session for session in cls._sessions.values()
+            if session.is_expired(now)
+        ]
+        for session in expired:
+            del cls._sessions[session.id]
+        return expired
+
+    @classmethod
+    def _close(cls, sessions: List[Session]):
+        for session in sessions:
+            session.close()
+
+    @classmethod
+    def add(cls, session: Session):
+        with cls._lock:
+            expired = cls._pop_expired()
+            full = len(cls._sessions) >= config.SESSIONS_MAX
+            if not full:
+                cls._sessions[session.id] = session
+        cls._close(expired)
+        if full:
+            raise SessionException(messages.MSG_9)
+
+    @classmethod
+    def get(cls, session_id: str) -> Session:
+        with cls._lock:
+            expired = cls._pop_expired()
+            session = cls._sessions.get(session_id)
+            if session is not None:
+                session.used_at = time.monotonic()
+        cls._close(expired)
+        if session is None:
+            raise SessionException()
+        return session
+
+    @classmethod
+    def remove(cls, session_id: str) -> Optional[Session]:
+        with cls._lock:
+            session = cls._sessions.pop(session_id, None)
+        if session is not None:
+            session.close()
+        return session
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            sessions = list(cls._sessions.values())
+            cls._sessions.clear()
+        cls._close(sessions)
+
+    @classmethod
+    def count(cls) -> int:
+        return len(cls._sessions)
@@ -0,0 +1,83 @@
+import json
+import hashlib
+import logging
+from datetime import datetime, timezone
+from dataclasses import asdict
+from logging.handlers import RotatingFileHandler
+from threading import Lock
+from typing import Optional, Iterator
+from app import config
+from app.entities import TimingData
+
+_lock = Lock()
+_handlers = {}
+
+
+def _get_logger() -> Optional[logging.Logger]:
+    path = config.SLOW_LOG_PATH
+    if not path:
+        return None
+    logger = logging.getLogger('app.slowlog')
+    with _lock:
+        if path not in _handlers:
+            for handler in _handlers.values():
+                logger.removeHandler(handler)
+                handler.close()
+            _handlers.clear()
+            handler = RotatingFileHandler(
+                path,
+                maxBytes=config.SLOW_LOG_MAX_BYTES,
+                backupCount=config.SLOW_LOG_BACKUP_COUNT,
+                encoding='utf-8'
+            )
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            _handlers[path] = handler
+    return logger
+
+
+def get_code_hash(code: str) -> str:
+    return hashlib.sha256(code.encode()).hexdigest()
+
+
+def is_slow(timing: TimingData) -> bool:
+    cpu = (timing.cpu_user or 0) + (timing.cpu_sys or 0)
+    return (
+        timing.wall >= config.SLOW_LOG_WALL_THRESHOLD
+        or cpu >= config.SLOW_LOG_CPU_THRESHOLD
+    )
+
+
+def write(
+    code: str,
+    stdin: str,
+    timing: TimingData,
+    verdict: str,
+    **extra
+):
+
+    """ Write the execution into the slow log
+        if it exceeds one of the thresholds """
+
+    if not is_slow(timing):
+        return
+    logger = _get_logger()
+    if logger is None:
+        return
+    record = {
+        'time': datetime.now(timezone.utc).isoformat(),
+        'code_hash': get_code_hash(code),
+        'stdin': stdin,
+        'timing': asdict(timing),
+        'verdict': verdict,
+        **extra
+    }
+    logger.info(json.dumps(record, ensure_ascii=False))
+
+
+def read(path: str) -> Iterator[dict]:
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
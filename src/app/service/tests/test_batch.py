@@ -0,0 +1,124 @@
+import pytest
+
+from app.service.batch import Batch, BatchProgram
+
+
+@pytest.mark.parametrize('code', [
+    'факт(1).',
+    'факт(1).\n?факт(Х).\nфакт(2).',
+    '?ВВОДЦЕЛ(Х),\nВЫВОД(Х).',
+    'факт(1)\n?факт(Х).',
+    '?ДОБ(факт(1)).\n?факт(Х).',
+    '?ЗАПИСЬ_В("file.txt").',
+])
+def test_parse__not_batchable__return_none(code):
+
+    # act
+    program = BatchProgram.parse(code)
+
+    # assert
+    assert program is None
+
+
+def test_parse__ok():
+
+    # arrange
+    code = 'чит:-ВВОДЦЕЛ(Ч),\n  ВЫВОД(Ч).\n?чит.\n?ВЕРСИЯ.'
+
+    # act
+    program = BatchProgram.parse(code)
+
+    # assert
+    assert program.clauses == ['чит:-ВВОДЦЕЛ(Ч),', '  ВЫВОД(Ч).']
+    assert program.queries == ['?чит.', '?ВЕРСИЯ.']
+
+
+def test_batch__stdin__ok():
+
+    # arrange
+    program = BatchProgram(clauses=['факт(1).'], queries=['?чит.'])
+
+    # act
+    batch = Batch(program=program, inputs=['1\n 2 ', None])
+
+    # assert
+    assert batch.stdin == (
+        'факт(1).\n'
+        '$1\n'
+        '$ 2\n'
+        '?чит.\n'
+        '?ТИХО,ВВОДСТР(Х).\n'
+        '?ТИХО,ВВОДСТР(Х).\n'
+        f'?ВЫВОД("{batch.token}").\n'
+        '?чит.\n'
+        f'?ВЫВОД("{batch.token}").'
+    )
+
+
+def test_feed__split_outputs__ok():
+
+    # arrange
+    program = BatchProgram(clauses=[], queries=['?чит.'])
+    batch = Batch(program=program, inputs=['1', '2', '3'])
+
+    # act
+    outputs = (
+        batch.feed(f'1\nДА\n{batch.token}\nД')
+        + batch.feed(f'А\n2{batch.token}')
+        + batch.feed('\nДА\n3')
+    )
+
+    # assert
+    assert outputs == ['1\nДА\n', '2']
+    assert batch.broken is False
+
+
+def test_feed__unexpected_answer__broken():
+
+    # arrange
+    program = BatchProgram(clauses=[], queries=['?чит.'])
+    batch = Batch(program=program, inputs=['1', '2'])
+
+    # act
+    outputs = batch.feed(f'1{batch.token}\nНЕТ\n2{batch.token}\nДА\n')
+
+    # assert
+    assert outputs == []
+    assert batch.broken is True
+
+
+def test_get_failed__ok():
+
+    # arrange
+    program = BatchProgram(clauses=['факт(1).'], queries=['?чит.'])
+    # lines: 2-5 the first input, 6-9 the second one
+    batch = Batch(program=program, inputs=['1', '2'])
+
+    # act
+    failed = batch.get_failed(
+        '4 Недостаточно входных данных\n'
+        '\n'
+        '7 Недостаточно входных данных\n'
+        '7 Can\'t read\n'
+    )
+
+    # assert
+    assert failed == {1}
+
+
+@pytest.mark.parametrize('error', [
+    '1 Ошибка при разборе: факт(1)',
+    '5 Prolog failure',
+    'std::bad_alloc',
+])
+def test_get_failed__outside_of_inputs__return_none(error):
+
+    # arrange
+    program = BatchProgram(clauses=['факт(1).'], queries=['?чит.'])
+    batch = Batch(program=program, inputs=['1', '2'])
+
+    # act
+    failed = batch.get_failed(error)
+
+    # assert
+    assert failed is None
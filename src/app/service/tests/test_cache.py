@@ -0,0 +1,153 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.entities import TimingData
+from app.service.cache import ResultCache
+from app.service.entities import ExecuteResult
+from app.service import metrics
+
+
+@pytest.fixture()
+def cache(tmp_path, mocker):
+    path = tmp_path / 'results.sqlite3'
+    mocker.patch('app.config.RESULT_CACHE_PATH', str(path))
+    mocker.patch('app.config.IMPORT_DIR', str(tmp_path / 'not_exists'))
+    mocker.patch(
+        'app.service.cache.ImportLibrary.get_version',
+        return_value='library'
+    )
+    return path
+
+
+def _get_exec_result(**kwargs) -> ExecuteResult:
+    return ExecuteResult(
+        result='some result',
+        error='some error',
+        timing=TimingData(queue_wait=1, spawn=0.1, wall=0.5, cpu_user=0.4),
+        **kwargs
+    )
+
+
+def test_get__put_result__ok(cache):
+
+    # arrange
+    key = ResultCache.get_key(code='some code', data_in='1 2')
+    ResultCache.put(key, _get_exec_result())
+    hits = metrics.get('result_cache_hits')
+
+    # act
+    exec_result = ResultCache.get(key, time_limit=1)
+
+    # assert
+    assert exec_result == ExecuteResult(
+        result='some result',
+        error='some error',
+        timing=TimingData(wall=0.5, cpu_user=0.4)
+    )
+    assert metrics.get('result_cache_hits') == hits + 1
+
+
+def test_get__other_worker__ok(cache):
+
+    # arrange
+    key = ResultCache.get_key(code='some code')
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(ResultCache.put, key, _get_exec_result()).result()
+
+    # act
+    exec_result = ResultCache.get(key, time_limit=1)
+
+    # assert
+    assert exec_result.result == 'some result'
+
+
+def test_get__wall_exceeds_time_limit__miss(cache):
+
+    # arrange
+    key = ResultCache.get_key(code='some code')
+    ResultCache.put(key, _get_exec_result())
+
+    # act
+    exec_result = ResultCache.get(key, time_limit=0.25)
+
+    # assert
+    assert exec_result is None
+
+
+def test_put__timeout__not_cache(cache):
+
+    # arrange
+    key = ResultCache.get_key(code='some code')
+
+    # act
+    ResultCache.put(key, _get_exec_result(timeout=True))
+
+    # assert
+    assert ResultCache.get(key, time_limit=1) is None
+
+
+def test_put__size_exceeded__evict_least_recently_used(cache, mocker):
+
+    # arrange
+    mocker.patch('app.config.RESULT_CACHE_EVICT_INTERVAL', 1)
+    mocker.patch('app.config.RESULT_CACHE_MAX_BYTES', 0)
+    keys = [ResultCache.get_key(code=f'code {i}') for i in range(20)]
+
+    # act
+    for key in keys:
+        ResultCache.put(key, _get_exec_result())
+
+    # assert
+    with sqlite3.connect(str(cache)) as connection:
+        count, = connection.execute('SELECT COUNT(*) FROM results').fetchone()
+    assert count < len(keys)
+    assert ResultCache.get(keys[0], time_limit=1) is None
+
+
+def test_get_key__depends_on_versions_and_limits(cache, mocker):
+
+    # arrange
+    key = ResultCache.get_key(code='some code', data_in=' 1 2\n')
+
+    # act
+    keys = {
+        ResultCache.get_key(code='some code', data_in='1 2'),
+        ResultCache.get_key(code='some code', data_in='1 2', memory_limit=64),
+        ResultCache.get_key(code='some code', data_in='1 3'),
+    }
+    mocker.patch(
+        'app.service.cache.ImportLibrary.get_version',
+        return_value='other library'
+    )
+    keys.add(ResultCache.get_key(code='some code', data_in='1 2'))
+
+    # assert
+    assert len(keys) == 4
+    assert key in keys
+
+
+@pytest.mark.parametrize('code', [
+    '?СЛУЧ(10,Х),ВЫВОД(Х).',
+    '?ЗАПИСЬ_В("output.txt").',
+])
+def test_get_key__nondeterministic__none(cache, code):
+
+    # act
+    key = ResultCache.get_key(code=code)
+
+    # assert
+    assert key is None
+
+
+def test_get_key__disabled__none(mocker):
+
+    # arrange
+    mocker.patch('app.config.RESULT_CACHE_PATH', None)
+
+    # act
+    key = ResultCache.get_key(code='some code')
+
+    # assert
+    assert key is None
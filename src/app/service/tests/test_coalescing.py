@@ -0,0 +1,91 @@
+import time
+from threading import Thread
+
+from app.service.coalescing import SingleFlight
+
+
+def test_join__first_caller__leader():
+
+    # arrange
+    flights = SingleFlight()
+
+    # act
+    flight, leader = flights.join('key', time_limit=1)
+
+    # assert
+    assert leader is True
+    assert len(flights) == 1
+
+
+def test_join__same_key__follower():
+
+    # arrange
+    flights = SingleFlight()
+    flight, _ = flights.join('key', time_limit=2)
+
+    # act
+    joined, leader = flights.join('key', time_limit=1)
+
+    # assert
+    assert leader is False
+    assert joined is flight
+
+
+def test_join__greater_time_limit__not_join():
+
+    # arrange
+    flights = SingleFlight()
+    flight, _ = flights.join('key', time_limit=1)
+
+    # act
+    other, leader = flights.join('key', time_limit=2)
+
+    # assert
+    assert leader is True
+    assert other is not flight
+    flights.leave('key', other)
+    assert len(flights) == 1
+
+
+def test_leave__ok():
+
+    # arrange
+    flights = SingleFlight()
+    flight, _ = flights.join('key', time_limit=1)
+
+    # act
+    flights.leave('key', flight)
+
+    # assert
+    assert len(flights) == 0
+    assert flights.join('key', time_limit=1)[1] is True
+
+
+def test_wait__finished__ok():
+
+    # arrange
+    flight, _ = SingleFlight().join('key', time_limit=1)
+    flight.start()
+    Thread(target=lambda: flight.finish(result='result')).start()
+
+    # act
+    done = flight.wait(time_limit=1, grace=0.1)
+
+    # assert
+    assert done is True
+    assert flight.result == 'result'
+
+
+def test_wait__deadline__not_done():
+
+    # arrange
+    flight, _ = SingleFlight().join('key', time_limit=10)
+    flight.start()
+
+    # act
+    started = time.monotonic()
+    done = flight.wait(time_limit=0.2, grace=0.1)
+
+    # assert
+    assert done is False
+    assert 0.3 <= time.monotonic() - started < 1
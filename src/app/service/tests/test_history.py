@@ -0,0 +1,47 @@
+from app.service.history import RuntimeHistory
+
+
+def test_get_key__ok():
+
+    # arrange
+    code_digest = RuntimeHistory.get_digest('?ВВОДЦЕЛ(x).')
+
+    # act
+    key_1 = RuntimeHistory.get_key(code_digest, '1')
+    key_2 = RuntimeHistory.get_key(code_digest, '2')
+
+    # assert
+    assert len(key_1) == 16
+    assert key_1 != key_2
+    assert key_1 == RuntimeHistory.get_key(code_digest, '1')
+
+
+def test_update__smooth__ok():
+
+    # arrange
+    history = RuntimeHistory(size=10, alpha=0.5)
+
+    # act
+    history.update(b'key', 1.0)
+    history.update(b'key', 3.0)
+
+    # assert
+    assert history.get(b'key') == 2.0
+
+
+def test_update__size_exceeded__evict_least_recent():
+
+    # arrange
+    history = RuntimeHistory(size=2)
+    history.update(b'key_1', 1.0)
+    history.update(b'key_2', 2.0)
+    history.update(b'key_1', 1.0)
+
+    # act
+    history.update(b'key_3', 3.0)
+
+    # assert
+    assert len(history) == 2
+    assert history.get(b'key_2') is None
+    assert history.get(b'key_1') == 1.0
+    assert history.get(b'key_3') == 3.0
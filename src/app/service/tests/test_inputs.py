@@ -0,0 +1,102 @@
+import os
+from collections import OrderedDict, Counter
+
+import pytest
+
+from app.service.inputs import InputCache
+
+
+@pytest.fixture()
+def cache(mocker):
+    mocker.patch('app.config.INPUT_FILE_THRESHOLD', 0)
+    mocker.patch.multiple(
+        InputCache,
+        _files=OrderedDict(),
+        _refs=Counter(),
+        _evicted=set(),
+        _size=0
+    )
+    yield InputCache
+    InputCache.clear()
+
+
+def _is_open(fd: int) -> bool:
+    try:
+        os.fstat(fd)
+    except OSError:
+        return False
+    return True
+
+
+def test_open__write_stripped_input__ok(cache):
+
+    # act
+    with cache.open(' 1 2\n3 4\n\n') as input_file:
+
+        # assert
+        with open(cache.get_path(input_file)) as f:
+            assert f.read() == '1 2\n3 4'
+        assert input_file.lines == 2
+        assert input_file.size == len('1 2\n3 4')
+
+
+def test_open__same_input__reuse_file(cache):
+
+    # arrange
+    with cache.open('1 2 3') as input_file:
+        pass
+
+    # act
+    with cache.open('1 2 3') as same_input_file:
+
+        # assert
+        assert same_input_file == input_file
+        assert _is_open(input_file.fd)
+
+
+def test_open__cache_overflow__close_unused_file(cache, mocker):
+
+    # arrange
+    mocker.patch('app.config.INPUT_CACHE_MAX_BYTES', 8)
+    with cache.open('11111') as old_input_file:
+        pass
+
+    # act
+    with cache.open('22222') as input_file:
+
+        # assert
+        assert not _is_open(old_input_file.fd)
+        assert _is_open(input_file.fd)
+
+
+def test_open__evicted_in_use__close_on_release(cache, mocker):
+
+    # arrange
+    mocker.patch('app.config.INPUT_CACHE_MAX_BYTES', 8)
+
+    # act
+    with cache.open('11111') as old_input_file:
+        with cache.open('22222'):
+            pass
+
+        # assert
+        assert _is_open(old_input_file.fd)
+    assert not _is_open(old_input_file.fd)
+
+
+@pytest.mark.parametrize('data_in,threshold,enabled', [
+    (None, 0, False),
+    ('   \n ', 0, False),
+    ('1 2 3', 5, True),
+    ('1 2 3', 6, False),
+])
+def test_is_enabled(data_in, threshold, enabled, mocker):
+
+    # arrange
+    mocker.patch('app.config.INPUT_FILE_THRESHOLD', threshold)
+
+    # act
+    result = InputCache.is_enabled(data_in)
+
+    # assert
+    assert result is enabled
@@ -0,0 +1,115 @@
+import os
+
+import pytest
+
+from app.service.library import ImportLibrary
+
+
+@pytest.fixture()
+def library(tmp_path, mocker):
+    source = tmp_path / 'import'
+    (source / 'pld').mkdir(parents=True)
+    (source / 'pld' / 'lib.pld').write_text('библиотека(1).')
+    mocker.patch('app.config.IMPORT_DIR', str(source))
+    mocker.patch('app.config.IMPORT_SNAPSHOT_DIR', str(tmp_path / 'shm'))
+    mocker.patch.multiple(
+        ImportLibrary,
+        _root=None,
+        _version=None,
+        _fingerprint=None,
+        _checked_at=None,
+        _retired={}
+    )
+    return source
+
+
+def test_get_root__make_snapshot__ok(library, tmp_path):
+
+    # act
+    root = ImportLibrary.get_root()
+
+    # assert
+    version = ImportLibrary.get_version()
+    assert version is not None
+    assert root == str(tmp_path / 'shm' / version)
+    with open(os.path.join(root, 'pld', 'lib.pld')) as f:
+        assert f.read() == 'библиотека(1).'
+    assert os.listdir(tmp_path / 'shm') == [version]
+
+
+def test_refresh__not_changed__keep_snapshot(library, mocker):
+
+    # arrange
+    ImportLibrary.refresh()
+    root = ImportLibrary.get_root()
+    copy_tree_spy = mocker.spy(ImportLibrary, '_copy_tree')
+
+    # act
+    ImportLibrary.refresh()
+
+    # assert
+    assert ImportLibrary.get_root() == root
+    copy_tree_spy.assert_not_called()
+
+
+def test_refresh__changed__swap_snapshot(library):
+
+    # arrange
+    ImportLibrary.refresh()
+    old_root = ImportLibrary.get_root()
+    old_version = ImportLibrary.get_version()
+    (library / 'pld' / 'lib.pld').write_text('библиотека(2).')
+
+    # act
+    ImportLibrary.refresh()
+
+    # assert
+    new_root = ImportLibrary.get_root()
+    assert ImportLibrary.get_version() != old_version
+    with open(os.path.join(new_root, 'pld', 'lib.pld')) as f:
+        assert f.read() == 'библиотека(2).'
+    # in-flight runs still can read the retired snapshot
+    assert os.path.isdir(old_root)
+    assert old_root in ImportLibrary._retired
+
+
+def test_refresh__retired_expired__remove(library, mocker):
+
+    # arrange
+    ImportLibrary.refresh()
+    old_root = ImportLibrary.get_root()
+    (library / 'pld' / 'lib.pld').write_text('библиотека(2).')
+    mocker.patch('app.config.IMPORT_SNAPSHOT_TTL', 0)
+
+    # act
+    ImportLibrary.refresh()
+
+    # assert
+    assert not os.path.exists(old_root)
+    assert ImportLibrary._retired == {}
+
+
+def test_refresh__source_not_exists__use_source(library, mocker):
+
+    # arrange
+    mocker.patch('app.config.IMPORT_DIR', 'not_exists')
+
+    # act
+    ImportLibrary.refresh()
+
+    # assert
+    assert ImportLibrary.get_root() == 'not_exists'
+    assert ImportLibrary.get_version() is None
+
+
+def test_refresh__snapshot_error__use_source(library, mocker):
+
+    # arrange
+    mocker.patch.object(ImportLibrary, '_copy_tree', side_effect=OSError)
+
+    # act
+    ImportLibrary.refresh()
+
+    # assert
+    assert ImportLibrary.get_root() == str(library)
+    assert ImportLibrary.get_version() is None
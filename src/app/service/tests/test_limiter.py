@@ -0,0 +1,119 @@
+import time
+from threading import Thread
+
+from app.entities import TimingData
+from app.service.limiter import AdaptiveLimiter
+
+
+def test_acquire__free_slot__not_wait():
+
+    # arrange
+    limiter = AdaptiveLimiter(initial=2, min_limit=1, max_limit=4)
+
+    # act
+    wait = limiter.acquire()
+
+    # assert
+    assert wait < 0.1
+    assert limiter.snapshot()['inflight'] == 1
+
+
+def test_acquire__limit_reached__wait_release():
+
+    # arrange
+    limiter = AdaptiveLimiter(initial=1, min_limit=1, max_limit=1)
+    limiter.acquire()
+    waits = []
+    thread = Thread(target=lambda: waits.append(limiter.acquire()))
+
+    # act
+    thread.start()
+    time.sleep(0.1)
+    waiting = limiter.snapshot()['waiting']
+    limiter.release()
+    thread.join(1)
+
+    # assert
+    assert waiting == 1
+    assert waits[0] >= 0.1
+    assert limiter.snapshot()['inflight'] == 1
+
+
+def test_release__not_contended__increase(mocker):
+
+    # arrange
+    mocker.patch('os.getloadavg', return_value=(0, 0, 0))
+    limiter = AdaptiveLimiter(initial=2, min_limit=1, max_limit=4)
+    timing = TimingData(wall=1, cpu_user=0.9, cpu_sys=0.05)
+
+    # act
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(timing)
+
+    # assert
+    snapshot = limiter.snapshot()
+    assert snapshot['limit'] == 3
+    assert [limit for _, limit in snapshot['history']] == [2, 3]
+
+
+def test_release__max_limit__not_increase(mocker):
+
+    # arrange
+    mocker.patch('os.getloadavg', return_value=(0, 0, 0))
+    limiter = AdaptiveLimiter(initial=2, min_limit=1, max_limit=2)
+
+    # act
+    limiter.acquire()
+    limiter.release(TimingData(wall=1, cpu_user=1, cpu_sys=0))
+
+    # assert
+    assert limiter.limit == 2
+
+
+def test_release__contended__decrease(mocker):
+
+    # arrange
+    mocker.patch('os.getloadavg', return_value=(0, 0, 0))
+    limiter = AdaptiveLimiter(initial=8, min_limit=1, max_limit=8)
+    timing = TimingData(wall=1, cpu_user=0.3, cpu_sys=0.1)
+
+    # act
+    limiter.acquire()
+    limiter.release(timing)
+    limiter.acquire()
+    limiter.release(timing)
+
+    # assert
+    # second decrease is skipped until the backoff interval passes
+    assert limiter.limit == 6
+
+
+def test_release__host_overloaded__decrease(mocker):
+
+    # arrange
+    mocker.patch('os.getloadavg', return_value=(1000, 0, 0))
+    limiter = AdaptiveLimiter(initial=4, min_limit=2, max_limit=8)
+
+    # act
+    limiter.acquire()
+    limiter.release(TimingData(wall=0.01, cpu_user=0.005, cpu_sys=0))
+
+    # assert
+    assert limiter.limit == 3
+    assert [limit for _, limit in limiter.snapshot()['history']] == [4, 3]
+
+
+def test_release__short_run__ignore_slowdown(mocker):
+
+    # arrange
+    mocker.patch('os.getloadavg', return_value=(0, 0, 0))
+    limiter = AdaptiveLimiter(initial=4, min_limit=1, max_limit=8)
+
+    # act
+    limiter.acquire()
+    limiter.release(TimingData(wall=0.01, cpu_user=0.001, cpu_sys=0))
+
+    # assert
+    assert limiter.limit == 4
+    assert limiter._limit > 4
@@ -0,0 +1,44 @@
+import pytest
+
+from app.service.precheck import is_silent
+
+
+@pytest.mark.parametrize('code', [
+    '',
+    'отец(иван,петр).',
+    'факт.\nдед(Х,З):-отец(Х,У),\n  отец(У,З).',
+    'сумма(А,Б,С):-СЛОЖЕНИЕ(А,Б,С).',
+    'список([1,-2|Т], [], "строка", [а]).',
+])
+def test_is_silent__clauses_only__true(code):
+
+    # act
+    result = is_silent(code)
+
+    # assert
+    assert result is True
+
+
+@pytest.mark.parametrize('code', [
+    '?ВЕРСИЯ.',
+    'отец(иван,петр).\n?отец(иван,Х).',
+    '?ВЫВОД(1)\n?ВЫВОД(2)',
+    'отец(иван,петр',
+    'отец(иван,петр)',
+    'отец(иван,"петр).',
+    'отец(иван,петр)).',
+    'а(1).',
+    'СЛОЖЕНИЕ(1).',
+    'ИМПОРТ(библиотека).',
+    'число(1.5).',
+    'дед:-[отец].',
+    'дед:-отец;мать.',
+    'факт. % комментарий',
+])
+def test_is_silent__goals_or_unknown_syntax__false(code):
+
+    # act
+    result = is_silent(code)
+
+    # assert
+    assert result is False
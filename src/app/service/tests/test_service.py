@@ -1,3 +1,8 @@
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Thread
 from unittest.mock import call
 
 import pytest
@@ -6,11 +11,20 @@ from app.service.main import PrologDService
 from app.entities import (
     DebugData,
     TestsData,
-    TestData
+    TestData,
+    TimingData,
+    SuiteData,
+    SessionData,
+    QueryData
 )
 from app.service.entities import ExecuteResult
-from app.service.exceptions import CheckerException
+from app.service.history import RuntimeHistory
+from app.service.suites import SuiteStorage
+from app.service.sessions import SessionStorage
+from app.service.exceptions import CheckerException, SessionException
 from app.service import messages
+from app.service import metrics
+from app.service import slowlog
 from app import config
 
 
@@ -385,6 +399,41 @@ def test_execute__empty_result__return_none(mocker):
     )
 
 
+@pytest.mark.parametrize('code', [
+    '\n\r\n',
+    'отец(иван,петр).\nдед(Х,З):-отец(Х,У),отец(У,З).',
+])
+def test_execute__no_goals__skip_execution(code, mocker):
+
+    # arrange
+    spawn_mock = mocker.patch.object(PrologDService, '_spawn')
+
+    # act
+    exec_result = PrologDService._execute(code=code, data_in='1 2')
+
+    # assert
+    assert exec_result.result is None
+    assert exec_result.error is None
+    spawn_mock.assert_not_called()
+
+
+def test_execute__result_cache__not_spawn_again(tmp_path, mocker):
+
+    # arrange
+    mocker.patch('app.config.RESULT_CACHE_PATH', str(tmp_path / 'cache'))
+    code = '?ВВОДСТР(С),ВЫВОД(С).'
+    expected = PrologDService._execute(code=code, data_in='привет')
+    spawn_spy = mocker.spy(PrologDService, '_spawn')
+
+    # act
+    exec_result = PrologDService._execute(code=code, data_in='привет')
+
+    # assert
+    assert exec_result.result == expected.result
+    assert exec_result.error == expected.error
+    spawn_spy.assert_not_called()
+
+
 def test_execute__write_to_file_system__error(mocker):
 
     # arrange
@@ -417,7 +466,7 @@ def test_execute__deep_recursive_1__error(mocker):
     execute_result = PrologDService._execute(code=code)
 
     # assert
-    assert execute_result.error == messages.MSG_1
+    assert execute_result.error == messages.MSG_1.format(1)
     assert execute_result.result is None
 
 
@@ -435,10 +484,356 @@ def test_execute__deep_recursive_2__error(mocker):
     execute_result = PrologDService._execute(code=code)
 
     # assert
-    assert execute_result.error == messages.MSG_1
+    assert execute_result.error == messages.MSG_1.format(1)
     assert execute_result.result is None
 
 
+def _wait_process_dead(pid: int, timeout: float = 1) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with open(f'/proc/{pid}/stat') as stat:
+                # killed orphan stays a zombie until init reaps it
+                if stat.read().split()[2] == 'Z':
+                    return True
+        except FileNotFoundError:
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_execute__timeout__kill_process_group(mocker):
+
+    # arrange
+    code = (
+       'baz(0). baz(1). baz(2).\n'
+       'qux(X):-baz(X), baz(Z), baz(Z), qux(Z).\n'
+       '?qux(X).'
+    )
+    mocker.patch('app.config.TIMEOUT', 1)
+    killpg_spy = mocker.spy(os, 'killpg')
+    killed = metrics.get('killed_processes')
+
+    # act
+    execute_result = PrologDService._execute(code=code)
+
+    # assert
+    assert execute_result.error == messages.MSG_1.format(1)
+    assert metrics.get('killed_processes') == killed + 1
+    pid = killpg_spy.call_args[0][0]
+    with pytest.raises(ChildProcessError):
+        os.waitpid(pid, os.WNOHANG)
+
+
+def test_kill__leaked_descendants__kill_and_count():
+
+    # arrange
+    proc = subprocess.Popen(
+        args=['sh', '-c', 'sleep 30 > /dev/null & echo $!'],
+        stdout=subprocess.PIPE,
+        start_new_session=True
+    )
+    sleep_pid = int(proc.communicate()[0])
+    leaked = metrics.get('leaked_processes')
+
+    # act
+    PrologDService._kill(proc)
+
+    # assert
+    assert metrics.get('leaked_processes') == leaked + 1
+    assert _wait_process_dead(sleep_pid)
+
+
+def test_kill__finished_process__not_count():
+
+    # arrange
+    proc = subprocess.Popen(args=['true'], start_new_session=True)
+    proc.wait()
+    before = metrics.snapshot()
+
+    # act
+    PrologDService._kill(proc)
+
+    # assert
+    assert metrics.snapshot() == before
+
+
+def test_execute__timing__ok():
+
+    # arrange
+    code = '?ВЫВОД("Ёё").'
+
+    # act
+    exec_result = PrologDService._execute(code=code)
+
+    # assert
+    timing = exec_result.timing
+    assert timing.spawn > 0
+    assert timing.wall > 0
+    assert timing.cpu_user is not None
+    assert timing.cpu_sys is not None
+    assert timing.output_bytes == len('Ёё\nДА\n'.encode())
+    assert 0 <= timing.queue_wait < 1
+    assert timing.checker is None
+
+
+def test_execute__slow__write_slow_log(tmp_path, mocker):
+
+    # arrange
+    data_in = '1 2 3'
+    code = '?ТИХО,ВВОДСТР(С),ВЫВОД(С).'
+    path = tmp_path / 'slow.log'
+    mocker.patch('app.config.SLOW_LOG_PATH', str(path))
+    mocker.patch('app.config.SLOW_LOG_WALL_THRESHOLD', 0)
+
+    # act
+    PrologDService._execute(code=code, data_in=data_in)
+
+    # assert
+    records = list(slowlog.read(str(path)))
+    assert len(records) == 1
+    assert records[0]['code_hash'] == slowlog.get_code_hash(code)
+    assert records[0]['stdin'] == PrologDService._get_stdin(
+        code=code,
+        data_in=data_in
+    )
+    assert records[0]['verdict'] == 'ok'
+    assert records[0]['time_limit'] == config.TIMEOUT
+    assert records[0]['memory_limit'] is None
+    assert records[0]['timing']['wall'] > 0
+
+
+def test_execute__not_slow__not_write_slow_log(tmp_path, mocker):
+
+    # arrange
+    path = tmp_path / 'slow.log'
+    mocker.patch('app.config.SLOW_LOG_PATH', str(path))
+    mocker.patch('app.config.SLOW_LOG_WALL_THRESHOLD', 100)
+    mocker.patch('app.config.SLOW_LOG_CPU_THRESHOLD', 100)
+
+    # act
+    PrologDService._execute(code='?ВЕРСИЯ.')
+
+    # assert
+    assert not path.exists() or path.read_text() == ''
+
+
+def test_execute__time_limit__error():
+
+    # arrange
+    code = (
+       'baz(0). baz(1). baz(2).\n'
+       'qux(X):-baz(X), baz(Z), baz(Z), qux(Z).\n'
+       '?qux(X).'
+    )
+
+    # act
+    execute_result = PrologDService._execute(code=code, time_limit=0.5)
+
+    # assert
+    assert execute_result.timeout is True
+    assert execute_result.error == (
+        'Program execution time limit exceeded. Limit 0.5 seconds!'
+    )
+    assert execute_result.timing.wall < 1.5
+
+
+def test_execute__memory_limit__error():
+
+    # arrange
+    code = (
+        'фун(Н,С):-СЛОЖЕНИЕ(Н,1,М),фун(М,[Н|С]).\n'
+        '?фун(1,[]).'
+    )
+
+    # act
+    execute_result = PrologDService._execute(code=code, memory_limit=64)
+
+    # assert
+    assert execute_result.timeout is False
+    assert execute_result.error == messages.MSG_7.format(64)
+
+
+@pytest.mark.parametrize('code,data_in', [
+    ('?ВВОДСТР(С),ВВОДЦЕЛ(Ч),ВЫВОД(С,Ч).', ' строка 1\n\n42 \n'),
+    ('?ВВОДЦЕЛ(А),ВВОДЦЕЛ(Б),ВЫВОД(А,Б).', '1\n 2\r\n3'),
+    ('?ВВОДСТР(А),ВВОДСТР(Б),ВВОДСТР(В).', '1\n2'),
+    ('baz:-#2+2#.\n?baz.', '1\n2\n3'),
+])
+def test_execute__input_file__same_as_stdin(code, data_in, mocker):
+
+    # arrange
+    mocker.patch('app.config.INPUT_FILE_THRESHOLD', len(data_in) + 1)
+    expected = PrologDService._execute(code=code, data_in=data_in)
+    mocker.patch('app.config.INPUT_FILE_THRESHOLD', 0)
+    spawn_spy = mocker.spy(PrologDService, '_spawn_and_communicate')
+
+    # act
+    exec_result = PrologDService._execute(code=code, data_in=data_in)
+
+    # assert
+    assert exec_result.result == expected.result
+    assert exec_result.error == expected.error
+    assert spawn_spy.call_args.kwargs['stdin'] == PrologDService._get_code(code)
+    assert len(spawn_spy.call_args.kwargs['pass_fds']) == 1
+
+
+def test_shift_error_lines__ok():
+
+    # arrange
+    error = '3 Ошибка при разборе: ?baz.\n3 Недопустимый символ (1)'
+
+    # act
+    result = PrologDService._shift_error_lines(error, offset=2)
+
+    # assert
+    assert result == '5 Ошибка при разборе: ?baz.\n5 Недопустимый символ (1)'
+
+
+def test_get_limits__default__ok():
+
+    # act
+    limits = PrologDService._get_limits()
+
+    # assert
+    assert limits == (config.TIMEOUT, None)
+
+
+def test_get_limits__exceed_server_maximums__clamp(mocker):
+
+    # arrange
+    mocker.patch('app.config.MAX_TIME_LIMIT', 5)
+    mocker.patch('app.config.MAX_MEMORY_LIMIT', 256)
+
+    # act
+    limits = PrologDService._get_limits(time_limit=60, memory_limit=4096)
+
+    # assert
+    assert limits == (5, 256)
+
+
+def _run_concurrently(func, *calls):
+    results = [None] * len(calls)
+
+    def target(i, kwargs):
+        results[i] = func(**kwargs)
+
+    threads = [
+        Thread(target=target, args=(i, kwargs))
+        for i, kwargs in enumerate(calls)
+    ]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_run__identical_in_flight__coalesce(mocker):
+
+    # arrange
+    def spawn(**kwargs):
+        time.sleep(0.3)
+        return ExecuteResult(
+            result='Р=120',
+            error=None,
+            timing=TimingData(wall=0.3)
+        )
+    spawn_mock = mocker.patch(
+        'app.service.main.PrologDService._spawn_and_communicate',
+        side_effect=spawn
+    )
+    coalesced = metrics.get('coalesced_executions')
+
+    # act
+    results = _run_concurrently(
+        PrologDService._run,
+        *[{'stdin': '?факториал(5,Р).'}] * 5
+    )
+
+    # assert
+    assert spawn_mock.call_count == 1
+    assert metrics.get('coalesced_executions') == coalesced + 4
+    assert [exec_result.result for exec_result in results] == ['Р=120'] * 5
+    assert len(PrologDService._flights) == 0
+
+
+def test_run__different_stdin__not_coalesce(mocker):
+
+    # arrange
+    spawn_mock = mocker.patch(
+        'app.service.main.PrologDService._spawn_and_communicate',
+        side_effect=lambda **kwargs: time.sleep(0.1) or ExecuteResult(
+            result=kwargs['stdin'],
+            error=None,
+            timing=TimingData(wall=0.1)
+        )
+    )
+
+    # act
+    results = _run_concurrently(
+        PrologDService._run,
+        {'stdin': '?ВЫВОД(1).'},
+        {'stdin': '?ВЫВОД(2).'}
+    )
+
+    # assert
+    assert spawn_mock.call_count == 2
+    assert [exec_result.result for exec_result in results] == [
+        '?ВЫВОД(1).',
+        '?ВЫВОД(2).'
+    ]
+
+
+def test_run__follower_time_limit_exceeded__timeout(mocker):
+
+    # arrange
+    mocker.patch(
+        'app.service.main.PrologDService._spawn_and_communicate',
+        side_effect=lambda **kwargs: time.sleep(0.5) or ExecuteResult(
+            result='some result',
+            error=None,
+            timing=TimingData(wall=0.5)
+        )
+    )
+
+    # act
+    leader, follower = _run_concurrently(
+        PrologDService._run,
+        {'stdin': '?тест.', 'time_limit': 10},
+        {'stdin': '?тест.', 'time_limit': 0.2}
+    )
+
+    # assert
+    assert leader.result == 'some result'
+    assert follower.result is None
+    assert follower.timeout is True
+    assert follower.error == messages.MSG_1.format(0.2)
+
+
+def test_run__real_prologd__coalesce(mocker):
+
+    # arrange
+    spawn_spy = mocker.spy(PrologDService, '_spawn_and_communicate')
+    code = (
+        'Фиб(1,1).\n'
+        'Фиб(2,1).\n'
+        'Фиб(Н,Ф):-БОЛЬШЕ(Н,2),Фиб(#Н-2#,А),Фиб(#Н-1#,Б),СЛОЖЕНИЕ(А,Б,Ф).\n'
+        '?Фиб(21,Ф).'
+    )
+
+    # act
+    results = _run_concurrently(
+        PrologDService._execute,
+        *[{'code': code}] * 3
+    )
+
+    # assert
+    assert spawn_spy.call_count < 3
+    assert [exec_result.result for exec_result in results] == ['Ф=10946'] * 3
+
+
 def test_execute__dob_for_fact__ok():
 
     # arrange
@@ -764,7 +1159,9 @@ def test_debug__ok(mocker):
     assert debug_result.error == execute_result.error
     execute_mock.assert_called_once_with(
         code=data.code,
-        data_in=data.data_in
+        data_in=data.data_in,
+        time_limit=None,
+        memory_limit=None
     )
 
 
@@ -811,25 +1208,488 @@ def test_testing__ok(mocker):
     assert tests_result[1].result == execute_result.result
     assert tests_result[1].error == execute_result.error
     assert tests_result[1].ok == check_result
-    assert execute_mock.call_args_list == [
-        call(
-            code=data.code,
-            data_in=test_1.data_in
+    # tests are run concurrently
+    assert execute_mock.call_count == 2
+    execute_mock.assert_has_calls(
+        [
+            call(
+                code=data.code,
+                data_in=test_1.data_in,
+                time_limit=None,
+                memory_limit=None
+            ),
+            call(
+                code=data.code,
+                data_in=test_2.data_in,
+                time_limit=None,
+                memory_limit=None
+            )
+        ],
+        any_order=True
+    )
+    assert check_mock.call_count == 2
+    check_mock.assert_has_calls(
+        [
+            call(
+                checker_func=data.checker,
+                right_value=test_1.data_out,
+                value=execute_result.result
+            ),
+            call(
+                checker_func=data.checker,
+                right_value=test_2.data_out,
+                value=execute_result.result
+            )
+        ],
+        any_order=True
+    )
+
+
+def test_debug__with_timing__ok(mocker):
+
+    # arrange
+    execute_result = ExecuteResult(
+        result='some execute code result',
+        error=None,
+        timing=TimingData(spawn=0.1, wall=0.2)
+    )
+    mocker.patch(
+        'app.service.main.PrologDService._execute',
+        return_value=execute_result
+    )
+    data = DebugData(code='some code', with_timing=True)
+
+    # act
+    debug_result = PrologDService.debug(data)
+
+    # assert
+    assert debug_result.timing == execute_result.timing
+
+
+def test_debug__without_timing__not_set(mocker):
+
+    # arrange
+    execute_result = ExecuteResult(
+        result='some execute code result',
+        error=None,
+        timing=TimingData(spawn=0.1, wall=0.2)
+    )
+    mocker.patch(
+        'app.service.main.PrologDService._execute',
+        return_value=execute_result
+    )
+    data = DebugData(code='some code')
+
+    # act
+    debug_result = PrologDService.debug(data)
+
+    # assert
+    assert debug_result.timing is None
+
+
+def test_testing__with_timing__ok(mocker):
+
+    # arrange
+    execute_result = ExecuteResult(
+        result='some execute code result',
+        error=None,
+        timing=TimingData(spawn=0.1, wall=0.2)
+    )
+    mocker.patch(
+        'app.service.main.PrologDService._execute',
+        return_value=execute_result
+    )
+    mocker.patch(
+        'app.service.main.PrologDService._check',
+        return_value=True
+    )
+    data = TestsData(
+        code='some code',
+        checker='some checker',
+        tests=[
+            TestData(data_in='some test input 1'),
+            TestData(data_in='some test input 2')
+        ],
+        with_timing=True
+    )
+
+    # act
+    testing_result = PrologDService.testing(data)
+
+    # assert
+    for test in testing_result.tests:
+        assert test.timing.spawn == 0.1
+        assert test.timing.wall == 0.2
+        assert test.timing.queue_wait >= 0
+        assert test.timing.checker >= 0
+    assert execute_result.timing.checker is None
+
+
+@pytest.mark.parametrize('verbosity,expected', [
+    ('full', 'some output'),
+    ('summary', None),
+    ('hash', (
+        '2676f208f2fcc556fefd4bd3a3168e39'
+        'ab771604712dd81b3e15cd9dab29c9b0'
+    )),
+    ('truncate:4', 'some'),
+    ('truncate:0', ''),
+])
+def test_compact_output__ok(verbosity, expected):
+
+    # act
+    result = PrologDService._compact_output('some output', verbosity)
+
+    # assert
+    assert result == expected
+
+
+def test_testing__verbosity_summary__keep_only_ok(mocker):
+
+    # arrange
+    mocker.patch(
+        'app.service.main.PrologDService._execute',
+        return_value=ExecuteResult(result='some result', error='some error')
+    )
+    check_mock = mocker.patch(
+        'app.service.main.PrologDService._check',
+        return_value=True
+    )
+    data = TestsData(
+        code='some code',
+        checker='some checker',
+        tests=[TestData(data_in='some input', data_out='some out')],
+        verbosity='summary'
+    )
+
+    # act
+    testing_result = PrologDService.testing(data)
+
+    # assert
+    test = testing_result.tests[0]
+    assert test.ok is True
+    assert test.result is None
+    assert test.error is None
+    check_mock.assert_called_once_with(
+        checker_func='some checker',
+        right_value='some out',
+        value='some result'
+    )
+
+
+def test_testing__concurrent__keep_order():
+
+    # arrange
+    data = TestsData(
+        code='?ВВОДЦЕЛ(x).',
+        checker=(
+            'def checker(right_value: str, value: str) -> bool:\n'
+            '    return right_value == value'
         ),
-        call(
-            code=data.code,
-            data_in=test_2.data_in
-        )
+        tests=[
+            TestData(data_in=str(i), data_out=f'x={i}')
+            for i in range(10)
+        ]
+    )
+
+    # act
+    testing_result = PrologDService.testing(data)
+
+    # assert
+    assert [test.result for test in testing_result.tests] == [
+        f'x={i}' for i in range(10)
+    ]
+    assert all(test.ok for test in testing_result.tests)
+
+
+def _get_batch_tests_data(**kwargs) -> TestsData:
+    return TestsData(
+        code=(
+            'чит:-ВВОДЦЕЛ(Ч),\n'
+            '  ВЫВОД(Ч).\n'
+            '?чит.'
+        ),
+        checker=(
+            'def checker(right_value: str, value: str) -> bool:\n'
+            '    return right_value == value'
+        ),
+        tests=[
+            TestData(data_in='1', data_out='1\nДА'),
+            TestData(data_in='x', data_out=''),
+            TestData(data_in='2 3', data_out='2\nДА'),
+            TestData(data_in=None, data_out=''),
+            TestData(data_in='4\n5', data_out='4\nДА'),
+        ],
+        **kwargs
+    )
+
+
+def test_testing__batch__same_as_single_processes(mocker):
+
+    # arrange
+    mocker.patch('app.config.BATCH_SIZE', 1)
+    expected = PrologDService.testing(_get_batch_tests_data())
+    mocker.patch('app.config.BATCH_SIZE', 16)
+    mocker.patch.object(PrologDService, '_history', RuntimeHistory(size=10))
+    spawn_spy = mocker.spy(PrologDService, '_spawn')
+    before = metrics.snapshot()
+
+    # act
+    testing_result = PrologDService.testing(_get_batch_tests_data())
+
+    # assert
+    assert [
+        (test.result, test.error, test.ok) for test in testing_result.tests
+    ] == [
+        (test.result, test.error, test.ok) for test in expected.tests
     ]
-    assert check_mock.call_args_list == [
-        call(
-            checker_func=data.checker,
-            right_value=test_1.data_out,
-            value=execute_result.result
+    assert testing_result.tests[0].ok is True
+    after = metrics.snapshot()
+    assert after['batched_tests'] - before.get('batched_tests', 0) == 4
+    # the batch and own process of the test with the input error
+    assert spawn_spy.call_count == 2
+
+
+def test_testing__batch_timeout__run_rest_in_own_processes(mocker):
+
+    # arrange
+    mocker.patch.object(PrologDService, '_history', RuntimeHistory(size=10))
+    data = TestsData(
+        code=(
+            'цикл(Н):-РАВНО(Н,0),цикл(Н).\n'
+            '?ВВОДЦЕЛ(Ч),ВЫВОД(Ч).\n'
+            '?ВВОДЦЕЛ(Ч),цикл(Ч).'
+        ),
+        checker=(
+            'def checker(right_value: str, value: str) -> bool:\n'
+            '    return True'
         ),
-        call(
-            checker_func=data.checker,
-            right_value=test_2.data_out,
-            value=execute_result.result
+        tests=[
+            TestData(data_in='1\n1', data_out=''),
+            TestData(data_in='2\n0', data_out=''),
+            TestData(data_in='3\n1', data_out=''),
+        ],
+        time_limit=0.5,
+        with_timing=True
+    )
+
+    # act
+    testing_result = PrologDService.testing(data)
+
+    # assert
+    tests = testing_result.tests
+    assert tests[0].result == '1Ч=1\nНЕТ'
+    assert tests[0].error is None
+    assert tests[1].error == messages.MSG_1.format(0.5)
+    assert tests[2].result == '3Ч=3\nНЕТ'
+    assert tests[2].error is None
+    assert all(test.timing.wall < 1 for test in tests)
+
+
+def test_testing__checker_exception__raise_exception(mocker):
+
+    # arrange
+    mocker.patch(
+        'app.service.main.PrologDService._execute',
+        return_value=ExecuteResult(result='1', error=None)
+    )
+    data = TestsData(
+        code='some code',
+        checker='invalid checker',
+        tests=[TestData(data_in='1'), TestData(data_in='2')]
+    )
+
+    # act
+    with pytest.raises(CheckerException) as ex:
+        PrologDService.testing(data)
+
+    # assert
+    assert ex.value.message == messages.MSG_2
+
+
+def test_testing__history__longest_first(mocker):
+
+    # arrange
+    mocker.patch.object(
+        PrologDService,
+        '_executor',
+        ThreadPoolExecutor(max_workers=1)
+    )
+    mocker.patch.object(
+        PrologDService,
+        '_history',
+        RuntimeHistory(size=10)
+    )
+    execute_mock = mocker.patch(
+        'app.service.main.PrologDService._execute',
+        side_effect=lambda **kwargs: ExecuteResult(
+            result=kwargs['data_in'],
+            error=None,
+            timing=TimingData(wall=float(kwargs['data_in']))
         )
+    )
+    mocker.patch(
+        'app.service.main.PrologDService._check',
+        return_value=True
+    )
+    data = TestsData(
+        code='some code',
+        checker='some checker',
+        tests=[TestData(data_in=str(wall)) for wall in (1, 3, 2)]
+    )
+    PrologDService.testing(data)
+    execute_mock.reset_mock()
+    data.tests.append(TestData(data_in='0.5'))
+
+    # act
+    testing_result = PrologDService.testing(data)
+
+    # assert
+    assert [
+        kwargs['data_in'] for _, kwargs in execute_mock.call_args_list
+    ] == ['0.5', '3', '2', '1']
+    assert [test.result for test in testing_result.tests] == [
+        '1', '3', '2', '0.5'
     ]
+
+
+def test_check__compile_checker_once__ok(mocker):
+
+    # arrange
+    checker_func = (
+        'def checker(right_value: str, value: str) -> bool:\n'
+        '    return right_value.lower() == value.lower()'
+    )
+    validate_spy = mocker.spy(PrologDService, '_validate_checker_func')
+
+    # act
+    results = [
+        PrologDService._check(
+            checker_func=checker_func,
+            right_value='ДА',
+            value=value
+        )
+        for value in ('да', 'нет', 'Да')
+    ]
+
+    # assert
+    assert results == [True, False, True]
+    assert validate_spy.call_count == 1
+
+
+def test_register_suite__ok(tmp_path, mocker):
+
+    # arrange
+    mocker.patch('app.config.SUITES_DIR', str(tmp_path))
+    data = SuiteData(
+        checker=(
+            'def checker(right_value: str, value: str) -> bool:\n'
+            '    return right_value == value'
+        ),
+        tests=[TestData(data_in='1', data_out='x=1')]
+    )
+
+    # act
+    suite = PrologDService.register_suite(data)
+
+    # assert
+    assert SuiteStorage.get(suite.id) == (data.checker, (('1', 'x=1'),))
+
+
+def test_register_suite__invalid_checker__raise_exception(tmp_path, mocker):
+
+    # arrange
+    mocker.patch('app.config.SUITES_DIR', str(tmp_path))
+    data = SuiteData(
+        checker='def my_checker(right_value, value): return True',
+        tests=[TestData(data_in='1', data_out='x=1')]
+    )
+
+    # act
+    with pytest.raises(CheckerException) as ex:
+        PrologDService.register_suite(data)
+
+    # assert
+    assert ex.value.message == messages.MSG_2
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.fixture()
+def sessions(mocker):
+    mocker.patch.object(SessionStorage, '_sessions', {})
+    yield SessionStorage
+    SessionStorage.clear()
+
+
+def test_query__prespawned_process__ok(sessions, mocker):
+
+    # arrange
+    session = PrologDService.create_session(
+        SessionData(code='отец(иван,петр).\nотец(петр,олег).')
+    )
+    spawn_spy = mocker.spy(PrologDService, '_spawn_and_communicate')
+
+    # act
+    data = PrologDService.query(
+        QueryData(
+            session_id=session.id,
+            query='?ВВОДСТР(С),отец(петр,О),ВЫВОД(С,О).',
+            data_in='сын',
+            with_timing=True
+        )
+    )
+
+    # assert
+    assert data.result == 'сынолегС=сын\nО=олег'
+    assert data.error is None
+    assert data.timing.spawn == 0
+    assert 0 < data.cpu_left < config.SESSION_CPU_BUDGET
+    spawn_spy.assert_not_called()
+
+
+def test_query__without_prespawned_process__ok(sessions, mocker):
+
+    # arrange
+    mocker.patch.object(PrologDService, '_prespawn')
+    session = PrologDService.create_session(
+        SessionData(code='отец(иван,петр).')
+    )
+
+    # act
+    data = PrologDService.query(
+        QueryData(session_id=session.id, query='?отец(иван,петр).')
+    )
+
+    # assert
+    assert data.result == 'ДА'
+    assert data.error is None
+
+
+def test_query__cpu_budget_exceeded__close_session(sessions, mocker):
+
+    # arrange
+    mocker.patch('app.config.SESSION_CPU_BUDGET', 0)
+    session = PrologDService.create_session(
+        SessionData(code='отец(иван,петр).')
+    )
+
+    # act
+    data = PrologDService.query(
+        QueryData(session_id=session.id, query='?отец(иван,петр).')
+    )
+
+    # assert
+    assert data.result == 'ДА'
+    assert data.error == messages.MSG_10.format(0)
+    assert data.cpu_left == 0
+    with pytest.raises(SessionException):
+        PrologDService.query(
+            QueryData(session_id=session.id, query='?отец(иван,петр).')
+        )
+
+
+def test_close_session__unknown__raise_exception(sessions):
+
+    # act
+    with pytest.raises(SessionException):
+        PrologDService.close_session('unknown')
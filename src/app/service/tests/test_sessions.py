@@ -0,0 +1,110 @@
+import subprocess
+
+import pytest
+
+from app.service.exceptions import SessionException
+from app.service.sessions import Session, SessionStorage
+from app.service import messages
+
+
+@pytest.fixture()
+def storage(mocker):
+    mocker.patch.object(SessionStorage, '_sessions', {})
+    yield SessionStorage
+    SessionStorage.clear()
+
+
+def _spawn_process() -> subprocess.Popen:
+    return subprocess.Popen(
+        ['cat'],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+
+def test_get__ok(storage):
+
+    # arrange
+    session = Session(code='some code', time_limit=1)
+    storage.add(session)
+
+    # act
+    result = storage.get(session.id)
+
+    # assert
+    assert result is session
+
+
+def test_get__unknown__raise_exception(storage):
+
+    # act
+    with pytest.raises(SessionException) as ex:
+        storage.get('unknown')
+
+    # assert
+    assert ex.value.message == messages.MSG_8
+
+
+def test_get__idle_timeout__close_session(storage, mocker):
+
+    # arrange
+    session = Session(code='some code', time_limit=1)
+    storage.add(session)
+    proc = _spawn_process()
+    session.set_process(proc, import_dir='some dir')
+    mocker.patch('app.config.SESSION_IDLE_TIMEOUT', 0)
+
+    # act
+    with pytest.raises(SessionException):
+        storage.get(session.id)
+
+    # assert
+    assert session.closed is True
+    assert proc.returncode is not None
+    assert storage.count() == 0
+
+
+def test_add__too_many_sessions__raise_exception(storage, mocker):
+
+    # arrange
+    mocker.patch('app.config.SESSIONS_MAX', 1)
+    storage.add(Session(code='some code', time_limit=1))
+
+    # act
+    with pytest.raises(SessionException) as ex:
+        storage.add(Session(code='some code', time_limit=1))
+
+    # assert
+    assert ex.value.message == messages.MSG_9
+    assert storage.count() == 1
+
+
+def test_pop_process__import_dir_changed__kill_process():
+
+    # arrange
+    session = Session(code='some code', time_limit=1)
+    proc = _spawn_process()
+    session.set_process(proc, import_dir='old dir')
+
+    # act
+    result = session.pop_process(import_dir='new dir')
+
+    # assert
+    assert result is None
+    assert proc.returncode is not None
+
+
+def test_set_process__closed__kill_process():
+
+    # arrange
+    session = Session(code='some code', time_limit=1)
+    session.close()
+    proc = _spawn_process()
+
+    # act
+    session.set_process(proc, import_dir='some dir')
+
+    # assert
+    assert proc.returncode is not None
+    assert session.pop_process(import_dir='some dir') is None
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from app.service.suites import SuiteStorage
+
+
+@pytest.fixture()
+def suites_dir(tmp_path, mocker):
+    path = tmp_path / 'suites'
+    mocker.patch('app.config.SUITES_DIR', str(path))
+    return path
+
+
+def test_save__ok(suites_dir):
+
+    # arrange
+    checker = 'def checker(right_value: str, value: str) -> bool: ...'
+    tests = [('1', 'x=1'), (None, 'x=2')]
+
+    # act
+    suite_id = SuiteStorage.save(checker=checker, tests=tests)
+
+    # assert
+    assert len(suite_id) == 32
+    assert SuiteStorage.exists(suite_id)
+    assert SuiteStorage.get(suite_id) == (checker, tuple(tests))
+    assert os.stat(suites_dir).st_mode & 0o777 == 0o700
+
+
+def test_save__same_content__same_id(suites_dir):
+
+    # arrange
+    tests = [('1', 'x=1')]
+
+    # act
+    suite_id_1 = SuiteStorage.save(checker='checker', tests=tests)
+    suite_id_2 = SuiteStorage.save(checker='checker', tests=tests)
+    suite_id_3 = SuiteStorage.save(checker='other checker', tests=tests)
+
+    # assert
+    assert suite_id_1 == suite_id_2
+    assert suite_id_1 != suite_id_3
+    assert len(os.listdir(suites_dir)) == 2
+
+
+@pytest.mark.parametrize('suite_id', ['0' * 32, '../../etc/passwd', None])
+def test_get__not_exists__raise_exception(suites_dir, suite_id):
+
+    # act
+    with pytest.raises(KeyError):
+        SuiteStorage.get(suite_id)
+
+    # assert
+    assert SuiteStorage.exists(suite_id) is False
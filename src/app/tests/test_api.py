@@ -1,9 +1,14 @@
 from app.entities import (
     DebugData,
     TestsData,
-    TestData
+    TestData,
+    TimingData,
+    SessionData,
+    QueryData
 )
-from app.service.exceptions import ServiceException
+from app.service.exceptions import ServiceException, SessionException
+from app.service import metrics
+from app.service.suites import SuiteStorage
 
 
 def test_debug__ok(client, mocker):
@@ -34,9 +39,93 @@ def test_debug__ok(client, mocker):
     assert response.status_code == 200
     assert response.json['result'] == debug_result.result
     assert response.json['error'] == debug_result.error
+    assert 'timing' not in response.json
     debug_mock.assert_called_once_with(serialized_data)
 
 
+def test_debug__timing__ok(client, mocker):
+
+    # arrange
+    request_data = {
+        'code': 'some code',
+        'timing': True
+    }
+    debug_result = DebugData(
+        result='some result',
+        timing=TimingData(
+            spawn=0.001,
+            wall=0.5,
+            cpu_user=0.4,
+            cpu_sys=0.05,
+            output_bytes=11
+        )
+    )
+    debug_mock = mocker.patch(
+        'app.service.main.PrologDService.debug',
+        return_value=debug_result
+    )
+
+    # act
+    response = client.post('/debug/', json=request_data)
+
+    # assert
+    assert response.status_code == 200
+    assert response.json['timing'] == {
+        'queue_wait': 0,
+        'spawn': 0.001,
+        'wall': 0.5,
+        'cpu_user': 0.4,
+        'cpu_sys': 0.05,
+        'output_bytes': 11,
+        'checker': None
+    }
+    debug_mock.assert_called_once_with(
+        DebugData(code='some code', with_timing=True)
+    )
+
+
+def test_debug__limits__ok(client, mocker):
+
+    # arrange
+    request_data = {
+        'code': 'some code',
+        'time_limit': 0.5,
+        'memory_limit': 64
+    }
+    debug_mock = mocker.patch(
+        'app.service.main.PrologDService.debug',
+        return_value=DebugData(result='some result')
+    )
+
+    # act
+    response = client.post('/debug/', json=request_data)
+
+    # assert
+    assert response.status_code == 200
+    debug_mock.assert_called_once_with(
+        DebugData(code='some code', time_limit=0.5, memory_limit=64)
+    )
+
+
+def test_debug__invalid_limits__bad_request(client, mocker):
+
+    # arrange
+    request_data = {
+        'code': 'some code',
+        'time_limit': 0,
+        'memory_limit': -1
+    }
+    service_mock = mocker.patch('app.service.main.PrologDService.debug')
+
+    # act
+    response = client.post('/debug/', json=request_data)
+
+    # assert
+    assert response.status_code == 400
+    assert set(response.json['details']) == {'time_limit', 'memory_limit'}
+    service_mock.assert_not_called()
+
+
 def test_debug__not_error__ok(client, mocker):
 
     # arrange
@@ -213,9 +302,107 @@ def test_testing__ok(client, mocker):
     assert response.json['tests'][1]['result'] == 'some result 2'
     assert response.json['tests'][1]['error'] == 'some error 2'
     assert response.json['tests'][1]['ok'] is False
+    assert 'timing' not in response.json['tests'][0]
     testing_mock.assert_called_once_with(serialized_data)
 
 
+def test_testing__timing__ok(client, mocker):
+
+    # arrange
+    request_data = {
+        'code': 'some code',
+        'checker': 'some func',
+        'timing': True,
+        'tests': [
+            {
+                'data_in': 'some test 1 input',
+                'data_out': 'some test 1 out'
+            }
+        ]
+    }
+    testing_result = TestsData(
+        tests=[
+            TestData(
+                result='some result 1',
+                ok=True,
+                timing=TimingData(wall=0.5, checker=0.01)
+            )
+        ]
+    )
+    testing_mock = mocker.patch(
+        'app.service.main.PrologDService.testing',
+        return_value=testing_result
+    )
+
+    # act
+    response = client.post('/testing/', json=request_data)
+
+    # assert
+    assert response.status_code == 200
+    assert 'timing' not in response.json
+    assert response.json['tests'][0]['timing']['wall'] == 0.5
+    assert response.json['tests'][0]['timing']['checker'] == 0.01
+    assert testing_mock.call_args[0][0].with_timing is True
+
+
+def test_testing__verbosity_summary__ok(client, mocker):
+
+    # arrange
+    request_data = {
+        'code': 'some code',
+        'checker': 'some func',
+        'verbosity': 'summary',
+        'tests': [
+            {
+                'data_in': 'some test 1 input',
+                'data_out': 'some test 1 out'
+            }
+        ]
+    }
+    testing_mock = mocker.patch(
+        'app.service.main.PrologDService.testing',
+        return_value=TestsData(
+            tests=[TestData(ok=True)],
+            verbosity='summary'
+        )
+    )
+
+    # act
+    response = client.post('/testing/', json=request_data)
+
+    # assert
+    assert response.status_code == 200
+    assert response.json == {
+        'num': 1,
+        'num_ok': 1,
+        'ok': True,
+        'tests': [{'ok': True}]
+    }
+    assert testing_mock.call_args[0][0].verbosity == 'summary'
+
+
+def test_testing__invalid_verbosity__bad_request(client, mocker):
+
+    # arrange
+    testing_mock = mocker.patch('app.service.main.PrologDService.testing')
+
+    # act
+    response = client.post(
+        '/testing/',
+        json={
+            'code': 'some code',
+            'checker': 'some func',
+            'verbosity': 'truncate:-1',
+            'tests': []
+        }
+    )
+
+    # assert
+    assert response.status_code == 400
+    assert 'verbosity' in response.json['details']
+    testing_mock.assert_not_called()
+
+
 def test_testing__not_test_result__ok(client, mocker):
 
     # arrange
@@ -388,3 +575,243 @@ def test_testing__validation_error__bad_request(client, mocker):
     }
     service_mock.assert_not_called()
 
+
+def test_metrics__ok(client):
+
+    # arrange
+    metrics.incr('killed_processes')
+
+    # act
+    response = client.get('/metrics/')
+
+    # assert
+    assert response.status_code == 200
+    assert response.json['killed_processes'] > 0
+    assert response.json['killed_processes'] == metrics.get(
+        'killed_processes'
+    )
+    concurrency = response.json['concurrency']
+    assert concurrency['limit'] >= 1
+    assert concurrency['inflight'] == 0
+    assert concurrency['history'][-1][1] == concurrency['limit']
+
+
+def test_register_suite__ok(client, mocker, tmp_path):
+
+    # arrange
+    mocker.patch('app.config.SUITES_DIR', str(tmp_path))
+    request_data = {
+        'checker': (
+            'def checker(right_value: str, value: str) -> bool:\n'
+            '    return right_value == value'
+        ),
+        'tests': [
+            {
+                'data_in': 'some test 1 input',
+                'data_out': 'some test 1 out'
+            }
+        ]
+    }
+
+    # act
+    response = client.post('/suites/', json=request_data)
+
+    # assert
+    assert response.status_code == 200
+    assert list(response.json) == ['id']
+    assert SuiteStorage.get(response.json['id']) == (
+        request_data['checker'],
+        (('some test 1 input', 'some test 1 out'),)
+    )
+
+
+def test_register_suite__validation_error__bad_request(client):
+
+    # act
+    response = client.post('/suites/', json={'tests': []})
+
+    # assert
+    assert response.status_code == 400
+    assert response.json['details'] == {
+        'checker': ['Missing data for required field.']
+    }
+
+
+def test_testing__suite_id__ok(client, mocker, tmp_path):
+
+    # arrange
+    mocker.patch('app.config.SUITES_DIR', str(tmp_path))
+    suite_id = SuiteStorage.save(
+        checker='some func',
+        tests=[
+            ('some test 1 input', 'some test 1 out'),
+            ('some test 2 input', 'some test 2 out')
+        ]
+    )
+    request_data = {
+        'code': 'some code',
+        'suite_id': suite_id
+    }
+    testing_result = TestsData(
+        tests=[
+            TestData(result='some result 1', ok=True),
+            TestData(result='some result 2', ok=True)
+        ]
+    )
+    testing_mock = mocker.patch(
+        'app.service.main.PrologDService.testing',
+        return_value=testing_result
+    )
+
+    # act
+    response = client.post('/testing/', json=request_data)
+
+    # assert
+    assert response.status_code == 200
+    assert response.json['num_ok'] == 2
+    assert response.json['tests'][1]['result'] == 'some result 2'
+    assert 'checker' not in response.json
+    testing_mock.assert_called_once_with(
+        TestsData(
+            code='some code',
+            checker='some func',
+            tests=[
+                TestData(
+                    data_in='some test 1 input',
+                    data_out='some test 1 out'
+                ),
+                TestData(
+                    data_in='some test 2 input',
+                    data_out='some test 2 out'
+                )
+            ]
+        )
+    )
+
+
+def test_testing__unknown_suite_id__bad_request(client, mocker, tmp_path):
+
+    # arrange
+    mocker.patch('app.config.SUITES_DIR', str(tmp_path))
+    service_mock = mocker.patch('app.service.main.PrologDService.testing')
+
+    # act
+    response = client.post(
+        '/testing/',
+        json={'code': 'some code', 'suite_id': '0' * 32}
+    )
+
+    # assert
+    assert response.status_code == 400
+    assert response.json['details'] == {'suite_id': ['Unknown suite.']}
+    service_mock.assert_not_called()
+
+
+def test_testing__suite_id_with_tests__bad_request(client, mocker, tmp_path):
+
+    # arrange
+    mocker.patch('app.config.SUITES_DIR', str(tmp_path))
+    suite_id = SuiteStorage.save(checker='some func', tests=[])
+    service_mock = mocker.patch('app.service.main.PrologDService.testing')
+
+    # act
+    response = client.post(
+        '/testing/',
+        json={
+            'code': 'some code',
+            'suite_id': suite_id,
+            'checker': 'other func',
+            'tests': []
+        }
+    )
+
+    # assert
+    assert response.status_code == 400
+    assert set(response.json['details']) == {'checker', 'tests'}
+    service_mock.assert_not_called()
+
+
+def test_create_session__ok(client, mocker):
+
+    # arrange
+    create_session_mock = mocker.patch(
+        'app.service.main.PrologDService.create_session',
+        return_value=SessionData(id='some id', cpu_budget=60)
+    )
+
+    # act
+    response = client.post(
+        '/sessions/',
+        json={'code': 'some code', 'time_limit': 1}
+    )
+
+    # assert
+    assert response.status_code == 200
+    assert response.json == {'id': 'some id', 'cpu_budget': 60}
+    create_session_mock.assert_called_once_with(
+        SessionData(code='some code', time_limit=1)
+    )
+
+
+def test_query__ok(client, mocker):
+
+    # arrange
+    query_mock = mocker.patch(
+        'app.service.main.PrologDService.query',
+        return_value=QueryData(result='some result', cpu_left=59.5)
+    )
+
+    # act
+    response = client.post(
+        '/sessions/some_id/',
+        json={'query': 'some query', 'data_in': 'some input'}
+    )
+
+    # assert
+    assert response.status_code == 200
+    assert response.json == {
+        'result': 'some result',
+        'error': None,
+        'cpu_left': 59.5
+    }
+    query_mock.assert_called_once_with(
+        QueryData(
+            query='some query',
+            data_in='some input',
+            session_id='some_id'
+        )
+    )
+
+
+def test_query__unknown_session__not_found(client, mocker):
+
+    # arrange
+    mocker.patch(
+        'app.service.main.PrologDService.query',
+        side_effect=SessionException()
+    )
+
+    # act
+    response = client.post('/sessions/some_id/', json={'query': 'some query'})
+
+    # assert
+    assert response.status_code == 404
+    assert response.json == {
+        'error': 'Session not found or expired',
+        'details': None
+    }
+
+
+def test_close_session__ok(client, mocker):
+
+    # arrange
+    close_session_mock = mocker.patch(
+        'app.service.main.PrologDService.close_session'
+    )
+
+    # act
+    response = client.delete('/sessions/some_id/')
+
+    # assert
+    assert response.status_code == 204
+    close_session_mock.assert_called_once_with('some_id')
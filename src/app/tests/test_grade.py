@@ -0,0 +1,100 @@
+import json
+
+from app import grade
+
+
+def _write_jsonl(path, items):
+    path.write_text(
+        ''.join(json.dumps(item, ensure_ascii=False) + '\n' for item in items),
+        encoding='utf-8'
+    )
+
+
+def _read_results(path) -> dict:
+    with open(path, encoding='utf-8') as f:
+        return {result['id']: result for result in map(json.loads, f)}
+
+
+def test_main__ok(tmp_path, capsys):
+
+    # arrange
+    suites = tmp_path / 'suites'
+    suites.mkdir()
+    checker = (
+        'def checker(right_value: str, value: str) -> bool:\n'
+        '  return right_value == value'
+    )
+    (suites / 'square.json').write_text(json.dumps({
+        'checker': checker,
+        'tests': [
+            {'data_in': '2', 'data_out': '4'},
+            {'data_in': '3', 'data_out': '9'}
+        ]
+    }))
+    code = '?ТИХО,ВВОДЦЕЛ(Х),УМНОЖЕНИЕ(Х,Х,У),ВЫВОД(У).'
+    submissions = tmp_path / 'submissions.jsonl'
+    _write_jsonl(submissions, [
+        {'id': 'first', 'code': code, 'suite': 'square'},
+        {'id': 'second', 'code': '?ТИХО,ВЫВОД(4).', 'suite': 'square'},
+        {
+            'id': 'third',
+            'code': code,
+            'checker': checker,
+            'tests': [{'data_in': '5', 'data_out': '25'}]
+        },
+        {'id': 'fourth', 'code': code, 'suite': 'unknown'},
+    ])
+    output = tmp_path / 'results.jsonl'
+
+    # act
+    exit_code = grade.main([
+        str(submissions),
+        '-o', str(output),
+        '--suites', str(suites),
+        '--processes', '2'
+    ])
+
+    # assert
+    assert exit_code == 0
+    results = _read_results(output)
+    assert results['first']['num_ok'] == 2
+    assert results['first']['tests'][1]['result'] == '9'
+    assert results['second']['num_ok'] == 1
+    assert results['second']['ok'] is False
+    assert results['third']['ok'] is True
+    assert results['fourth'] == {
+        'id': 'fourth',
+        'error': 'Validation error',
+        'details': {'suite': ['Unknown suite.']}
+    }
+    out = capsys.readouterr().out
+    assert out.startswith('submissions: 4, tests: 5, passed: 4,')
+
+
+def test_main__interrupted__resume(tmp_path, capsys):
+
+    # arrange
+    submissions = tmp_path / 'submissions'
+    submissions.mkdir()
+    for name in ('first', 'second'):
+        (submissions / f'{name}.json').write_text(json.dumps({
+            'code': '?ТИХО,ВЫВОД(1).',
+            'checker': (
+                'def checker(right_value: str, value: str) -> bool:\n'
+                '  return right_value == value'
+            ),
+            'tests': [{'data_out': '1'}]
+        }))
+    output = tmp_path / 'results.jsonl'
+    output.write_text('{"id": "first", "ok": true}\n{"id": "sec')
+
+    # act
+    grade.main([str(submissions), '-o', str(output), '--processes', '1'])
+
+    # assert
+    results = _read_results(output)
+    assert results['first'] == {'id': 'first', 'ok': True}
+    assert results['second']['ok'] is True
+    assert len(results) == 2
+    out = capsys.readouterr().out
+    assert out.startswith('submissions: 1, tests: 1, passed: 1,')
@@ -0,0 +1,49 @@
+from app import replay
+from app.service import slowlog
+from app.service.main import PrologDService
+
+
+def test_replay__ok(tmp_path, mocker, capsys):
+
+    # arrange
+    path = tmp_path / 'slow.log'
+    mocker.patch('app.config.SLOW_LOG_PATH', str(path))
+    mocker.patch('app.config.SLOW_LOG_WALL_THRESHOLD', 0)
+    mocker.patch('app.config.PROLOGD_BIN', 'prologd')
+    PrologDService._execute(code='?ВВОДЦЕЛ(x).', data_in='42')
+    PrologDService._execute(code='?ВЫВОД(1).')
+    run_spy = mocker.spy(PrologDService, '_run')
+
+    # act
+    exit_code = replay.main([str(path), '--repeat', '2'])
+
+    # assert
+    assert exit_code == 0
+    records = list(slowlog.read(str(path)))
+    assert len(records) == 2
+    assert run_spy.call_count == 4
+    assert run_spy.call_args_list[0][1]['stdin'] == records[0]['stdin']
+    out = capsys.readouterr().out.splitlines()
+    assert len(out) == 4
+    assert out[1].startswith(records[0]['code_hash'][:12])
+    assert out[1].endswith('\tok')
+    assert out[3].startswith('records: 2,')
+    assert out[3].endswith('verdict changes: 0')
+
+
+def test_replay__verdict_changed__ok(tmp_path, mocker, capsys):
+
+    # arrange
+    path = tmp_path / 'slow.log'
+    mocker.patch('app.config.SLOW_LOG_PATH', str(path))
+    mocker.patch('app.config.SLOW_LOG_WALL_THRESHOLD', 0)
+    mocker.patch('app.config.PROLOGD_BIN', 'prologd')
+    PrologDService._execute(code='?ВЫВОД(1).')
+
+    # act
+    replay.main([str(path), '--prologd', 'sh'])
+
+    # assert
+    out = capsys.readouterr().out.splitlines()
+    assert out[1].endswith('\tok -> error')
+    assert out[2].endswith('verdict changes: 1')